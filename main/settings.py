@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'objectbank.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -61,8 +63,9 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'objectbank.renderers.ORJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
+        'objectbank.renderers.MessagePackRenderer',
     ],
 }
 
@@ -83,18 +86,55 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'main.wsgi.application'
 
+# main/asgi.py turns this on to route the async API views (objectbank/api_urls.py)
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', '0') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# SQLite concurrency mode: WAL and tuned pragmas on every connection
+# (objectbank/db.py), persistent connections, IMMEDIATE write transactions
+# and a single writer thread for short writes. Set SQLITE_CONCURRENCY_MODE=0
+# for plain SQLite.
+SQLITE_CONCURRENCY_MODE = os.getenv('SQLITE_CONCURRENCY_MODE', '1') == '1'
+SQLITE_WRITE_QUEUE = SQLITE_CONCURRENCY_MODE
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'maincore.sqlite3',
+        'CONN_MAX_AGE': 600 if SQLITE_CONCURRENCY_MODE else 0,
+        'CONN_HEALTH_CHECKS': SQLITE_CONCURRENCY_MODE,
+        'OPTIONS': {
+            'timeout': 20,
+            **({'transaction_mode': 'IMMEDIATE'} if SQLITE_CONCURRENCY_MODE else {}),
+        },
+    }
+}
+
+
+# Cache
+# LocMemCache is per process; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.filebased.FileBasedCache and a
+# directory) when running several workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'objectbank'),
     }
 }
 
 
+# Sessions and messages
+# Sessions are read from the cache and written through to the database;
+# flash messages live in a signed cookie, so neither costs a query per page.
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -134,10 +174,60 @@ STATIC_URL = '/static/'
 # Tell Django where your project-level static folder is
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# `manage.py build_assets` vendors the CDN libraries into static/vendor and
+# collects minified, fingerprinted, precompressed files into STATIC_ROOT;
+# WhiteNoise serves the fingerprinted ones with immutable cache headers.
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "objectbank.storage.StaticAssetStorage"},
+}
+
 # Varibles
 LOGIN_URL = "/login"
 PROJ02_URL = os.getenv('PROJ02_URL')
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_GROUPS = [
     int(x) for x in os.getenv("TELEGRAM_GROUPS", "").split(",") if x
-]
\ No newline at end of file
+]
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+# Telegram allows ~30 messages/s per bot and ~20 messages/min per group.
+TELEGRAM_RATE_PER_SECOND = float(os.getenv("TELEGRAM_RATE_PER_SECOND", "25"))
+TELEGRAM_CHAT_RATE_PER_MINUTE = float(os.getenv("TELEGRAM_CHAT_RATE_PER_MINUTE", "20"))
+
+# Metrics (objectbank/middleware.py, served at /metrics)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_SLOW_MS = float(os.getenv("METRICS_SLOW_MS", "500"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Short links (/l/<link_name>): in-process LRU in front of the cache, and
+# redirect hit counters flushed to the database every few seconds.
+SHORTLINK_LOCAL_SIZE = int(os.getenv("SHORTLINK_LOCAL_SIZE", "10000"))
+SHORTLINK_LOCAL_TTL = float(os.getenv("SHORTLINK_LOCAL_TTL", "5"))
+SHORTLINK_CACHE_TIMEOUT = int(os.getenv("SHORTLINK_CACHE_TIMEOUT", "300"))
+SHORTLINK_HIT_FLUSH_SECONDS = float(os.getenv("SHORTLINK_HIT_FLUSH_SECONDS", "10"))
+
+# Throttling (objectbank/throttling.py): "<count>/<second|minute|hour|day>"
+# token buckets per IP, per username/user and global. password_hash is one
+# budget for every login and signup POST, sized to what the CPUs can hash.
+# Set THROTTLE_SHARED=1 to keep the budgets in the cache when several
+# processes share one (LocMemCache is per process).
+THROTTLE_SHARED = os.getenv("THROTTLE_SHARED", "0") == "1"
+THROTTLE_RATES = {
+    "login_ip": os.getenv("THROTTLE_LOGIN_IP", "20/minute"),
+    "login_user": os.getenv("THROTTLE_LOGIN_USER", "10/minute"),
+    "signup_ip": os.getenv("THROTTLE_SIGNUP_IP", "10/hour"),
+    "password_hash": os.getenv("THROTTLE_PASSWORD_HASH", f"{2 * (os.cpu_count() or 1)}/second"),
+    "write_user": os.getenv("THROTTLE_WRITE_USER", "120/minute"),
+    "write": os.getenv("THROTTLE_WRITE", "200/second"),
+}
+
+# Offline pincode geocoder (objectbank/geocoder.py): profiles saved with a
+# pincode but no coordinates get the pincode's centroid. Build the file with
+# `manage.py build_pincode_index <csv>`; without it nothing is geocoded.
+PINCODE_DATASET = os.getenv("PINCODE_DATASET", str(BASE_DIR / "data" / "pincodes.npy"))
+
+# Archive (objectbank/archive.py, `manage.py archive --interval N`): links
+# inactive this long, and deleted users' links, move to the archive tables.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
@@ -1,7 +1,145 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.http import StreamingHttpResponse
+from .archive import set_links_active
+from .caching import bump_version
+from .datasets import buffered, csv_lines
+from .db import run_write
 from .models import (
-    UserProfile
+    LinkRegistry, UserProfile
 )
+from .pagination import EstimatedCountPaginator
+from .search import search_profiles
 
-# Register your models here.
-admin.site.register(UserProfile)
\ No newline at end of file
+# =============== Admin ===============
+# Changelists page with estimated counts, select their FKs in one join
+# and only search through indexes, so they stay fast at 100k+ rows.
+# Actions work through the selection in ADMIN_BATCH_SIZE-row write
+# transactions rather than saving rows one by one.
+ADMIN_BATCH_SIZE = 1000
+
+
+def batches(queryset, field='id', batch_size=ADMIN_BATCH_SIZE):
+    ids = list(queryset.order_by(field).values_list(field, flat=True))
+    for start in range(0, len(ids), batch_size):
+        yield ids[start:start + batch_size]
+
+
+def username_prefix(term):
+    # A range on LOWER(username) stays on search.USERNAME_INDEX; icontains would not.
+    term = term.lower()
+    return User.objects.annotate(lower=Lower('username')).filter(
+        lower__gte=term, lower__lt=term + '\U0010ffff'
+    ).values('id')
+
+
+def export_csv(dataset, queryset):
+    response = StreamingHttpResponse(buffered(csv_lines(dataset, queryset)), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.csv"'
+    return response
+
+
+def set_users_active(ids, active):
+    updated = User.objects.filter(id__in=ids).exclude(is_active=active).update(is_active=active)
+    if updated:
+        transaction.on_commit(lambda: bump_version(User))
+    return updated
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skips the second, unfiltered COUNT(*) behind "N results (M total)".
+    show_full_result_count = False
+    list_per_page = 100
+    raw_id_fields = ('user',)
+    list_select_related = ('user',)
+
+    def report(self, request, changed, noun, verb, skipped=0, reason=''):
+        self.message_user(request, f"{verb} {changed} {noun}.", messages.SUCCESS)
+        if skipped:
+            self.message_user(request, f"Skipped {skipped} {noun}: {reason}.", messages.WARNING)
+
+# =============== UserProfile ===============
+@admin.register(UserProfile)
+class UserProfileAdmin(ScalableAdmin):
+    list_display = ('id', 'name', 'user', 'email', 'phone', 'pincode', 'dob', 'updated_at')
+    readonly_fields = ('geohash', 'created_at', 'updated_at')
+    search_fields = ('name', 'email', 'phone', 'pincode', 'user__username')
+    search_help_text = "Words in name, email, phone or pincode (prefix match), or the start of a username."
+    actions = ('activate_users', 'deactivate_users', 'export_selected')
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # The FTS index (search.py) instead of an icontains scan per field. It
+        # stays a subquery with no limit, so every match can be paged to.
+        matches = search_profiles(UserProfile.objects.all(), term, limit=None).values('id')
+        return queryset.filter(Q(id__in=matches) | Q(user__in=username_prefix(term))), False
+
+    @admin.action(description="Activate selected profiles' users")
+    def activate_users(self, request, queryset):
+        self.set_active(request, queryset, True)
+
+    @admin.action(description="Deactivate selected profiles' users")
+    def deactivate_users(self, request, queryset):
+        self.set_active(request, queryset, False)
+
+    def set_active(self, request, queryset, active):
+        changed = 0
+        for ids in batches(queryset, 'user_id'):
+            changed += run_write(set_users_active, ids, active)
+        self.report(request, changed, "users", "Activated" if active else "Deactivated")
+
+    @admin.action(description="Export selected profiles as CSV")
+    def export_selected(self, request, queryset):
+        return export_csv('profiles', queryset)
+
+# =============== Link Registry ===============
+@admin.register(LinkRegistry)
+class LinkRegistryAdmin(ScalableAdmin):
+    list_display = ('id', 'link_name', 'link_url', 'user', 'active', 'hits', 'updated_at')
+    list_filter = ('active',)
+    # link_user_updated_idx and link_active_updated_idx serve this order.
+    ordering = ('-updated_at', '-id')
+    readonly_fields = ('hits', 'created_at', 'updated_at')
+    search_fields = ('link_name', 'user__username')
+    search_help_text = "The start of a link name or username, or a link id."
+    actions = ('activate_links', 'deactivate_links', 'export_selected')
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # link_name is stored upper-cased; a range stays on link_name_id_idx.
+        name = term.upper()
+        lookup = Q(link_name__gte=name, link_name__lt=name + '\U0010ffff') | Q(user__in=username_prefix(term))
+        if term.isdigit():
+            lookup |= Q(id=int(term))
+        return queryset.filter(lookup), False
+
+    @admin.action(description="Activate selected links")
+    def activate_links(self, request, queryset):
+        self.set_active(request, queryset, True)
+
+    @admin.action(description="Deactivate selected links")
+    def deactivate_links(self, request, queryset):
+        self.set_active(request, queryset, False)
+
+    def set_active(self, request, queryset, active):
+        changed = skipped = 0
+        for ids in batches(queryset):
+            batch_changed, batch_skipped = run_write(set_links_active, ids, active)
+            changed += len(batch_changed)
+            skipped += batch_skipped
+        self.report(
+            request, changed, "links", "Activated" if active else "Deactivated",
+            skipped, "another active link has the same name",
+        )
+
+    @admin.action(description="Export selected links as CSV")
+    def export_selected(self, request, queryset):
+        return export_csv('links', queryset)
@@ -1,18 +1,35 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
-    auth, views, link_registry
+    auth, views, link_registry, profile, exports, changes, archive
 )
 
-router = DefaultRouter()
-router.register(r'links', link_registry.LinkRegistryViewSet, basename='links')
+def api_patterns(asynchronous=False):
+    """API routes; `asynchronous` swaps in the native async read views."""
+    router = DefaultRouter()
+    router.register(
+        r'links',
+        link_registry.AsyncLinkRegistryViewSet if asynchronous else link_registry.LinkRegistryViewSet,
+        basename='links',
+    )
+    router.register(r'archive/links', archive.ArchivedLinkViewSet, basename='archived-links')
+    router.register(r'archive/users', archive.ArchivedUserViewSet, basename='archived-users')
 
-urlpatterns = [
-    # function-based or class-based non-viewset APIs
-    path('', views.public_api, name='public-api'),
-    path('items/', views.items_api, name='items-api'),
-    path('users/', auth.user_list, name='user-list'),
+    return [
+        # function-based or class-based non-viewset APIs
+        path('', views.apublic_api if asynchronous else views.public_api, name='public-api'),
+        path('items/', views.aitems_api if asynchronous else views.items_api, name='items-api'),
+        path('users/', auth.auser_list if asynchronous else auth.user_list, name='user-list'),
+        path('users/search/', auth.user_search, name='user-search'),
+        path('profiles/', profile.profile_list, name='profile-list'),
+        path('profiles/nearby/', profile.profile_nearby, name='profile-nearby'),
+        path('profiles/birthdays/', profile.profile_birthdays, name='profile-birthdays'),
+        path('export/<str:dataset>/', exports.export_view, name='export'),
+        path('changes/', changes.change_feed, name='change-feed'),
 
-    # DRF router URLs
-    path('', include(router.urls)),
-]
+        # DRF router URLs
+        path('', include(router.urls)),
+    ]
+
+urlpatterns = api_patterns(settings.ASYNC_VIEWS)
@@ -0,0 +1,163 @@
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+from . import shortlinks
+from .caching import bump_version
+from .changes import record_many, snapshot
+from .models import ArchivedLink, ArchivedUser, ChangeLog, LinkHealth, LinkRegistry, UserProfile
+
+# =============== Hot/Cold Archive ===============
+# Inactive links and deleted users' data move to the Archived* tables in
+# batched passes (`manage.py archive`), so LinkRegistry holds live rows
+# only. Each batch is one transaction: copy, delete, and a change-feed
+# tombstone per row, since the row has left the hot set.
+
+
+def archived_link(link, reason, now):
+    return ArchivedLink(
+        id=link.id, user_id=link.user_id, username=link.user.username,
+        link_name=link.link_name, link_url=link.link_url,
+        created_at=link.created_at, updated_at=link.updated_at, hits=link.hits,
+        reason=reason, archived_at=now,
+    )
+
+
+def archive_batch(queryset, reason, batch_size):
+    """Move up to `batch_size` links of `queryset`; returns how many moved."""
+    with transaction.atomic():
+        links = list(queryset.select_related('user').order_by('id')[:batch_size])
+        if not links:
+            return 0
+        now = timezone.now()
+        ids = [link.id for link in links]
+        # A link restored and deactivated again replaces its old archive row.
+        ArchivedLink.objects.filter(id__in=ids).delete()
+        ArchivedLink.objects.bulk_create([archived_link(link, reason, now) for link in links])
+        LinkHealth.objects.filter(link_id__in=ids).delete()
+        # A plain DELETE: the collector would send post_delete (and log a
+        # change, bump the version) once per row.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {LinkRegistry._meta.db_table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids
+            )
+        record_many(links, ChangeLog.DELETE)
+        transaction.on_commit(lambda: bump_version(LinkRegistry, now))
+        transaction.on_commit(shortlinks.invalidate)
+    return len(links)
+
+
+def stale_links(cutoff):
+    # Links the checker switched off stay hot, so it can switch them back on.
+    return LinkRegistry.objects.filter(active=False, updated_at__lt=cutoff).exclude(health__flagged=True)
+
+
+def set_links_active(ids, active):
+    """
+    Switch links `ids` on or off in one UPDATE. Returns the links changed
+    and how many were skipped because their name is active already.
+    """
+    links = list(LinkRegistry.objects.filter(id__in=ids).exclude(active=active).order_by('id'))
+    skipped = 0
+    if active:
+        # link_active_name_uniq allows one active link per name.
+        taken = set(LinkRegistry.objects.filter(
+            active=True, link_name__in={link.link_name for link in links}
+        ).values_list('link_name', flat=True))
+        kept = []
+        for link in links:
+            if link.link_name in taken:
+                skipped += 1
+                continue
+            taken.add(link.link_name)
+            kept.append(link)
+        links = kept
+    if not links:
+        return [], skipped
+    now = timezone.now()
+    LinkRegistry.objects.filter(id__in=[link.id for link in links]).update(active=active, updated_at=now)
+    for link in links:
+        link.active = active
+        link.updated_at = now
+    record_many(links, ChangeLog.UPDATE)
+    transaction.on_commit(lambda: bump_version(LinkRegistry, now))
+    transaction.on_commit(shortlinks.invalidate)
+    return links, skipped
+
+
+def retire_user(user):
+    """
+    Soft-delete `user` at once: snapshot it, deactivate it and its links.
+    The next archive pass moves the links and purges the user.
+    """
+    profile = UserProfile.objects.filter(user=user).first()
+    active_ids = LinkRegistry.objects.filter(user=user, active=True).values_list('id', flat=True)
+    deactivated, _ = set_links_active(list(active_ids), False)
+    # Retiring a user twice keeps the links switched off the first time.
+    previous = ArchivedUser.objects.filter(pk=user.pk, purged_at__isnull=True).values_list('link_ids', flat=True)
+    ArchivedUser.objects.update_or_create(id=user.pk, defaults={
+        'username': user.username,
+        'email': user.email,
+        'date_joined': user.date_joined,
+        'last_login': user.last_login,
+        'profile': snapshot(profile) if profile else None,
+        'link_ids': sorted(set(previous.first() or []) | {link.id for link in deactivated}),
+        'deleted_at': timezone.now(),
+        'purged_at': None,
+    })
+    user.is_active = False
+    user.save(update_fields=['is_active'])
+
+
+def restore_user(archived):
+    """Undo retire_user for a user an admin reactivated; returns links restored."""
+    with transaction.atomic():
+        restored, _ = set_links_active(archived.link_ids, True)
+        archived.delete()
+    return len(restored)
+
+
+def reactivated(archived):
+    return User.objects.filter(pk=archived.id, is_active=True).exists()
+
+
+def purge_user(archived, batch_size):
+    """
+    Archive a retired user's links batch by batch, then delete the user.
+    Returns the links moved, or None if the user was reactivated instead.
+    """
+    if reactivated(archived):
+        restore_user(archived)
+        return None
+    moved = 0
+    links = LinkRegistry.objects.filter(user_id=archived.id)
+    while batch := archive_batch(links, ArchivedLink.USER_DELETED, batch_size):
+        moved += batch
+    with transaction.atomic():
+        # Profile and any other dependents go with it; links are gone already.
+        if reactivated(archived):
+            # Reactivated while its links were moving: keep it, restore what is left.
+            restore_user(archived)
+            return None
+        User.objects.filter(pk=archived.id).delete()
+        ArchivedUser.objects.filter(pk=archived.pk).update(purged_at=timezone.now())
+    return moved
+
+
+def run(days=None, batch_size=None):
+    """One archive pass; returns counts of what moved."""
+    days = settings.ARCHIVE_AFTER_DAYS if days is None else days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    summary = {'users': 0, 'user_links': 0, 'links': 0, 'restored': 0}
+    for archived in ArchivedUser.objects.filter(purged_at__isnull=True).order_by('id'):
+        moved = purge_user(archived, batch_size)
+        if moved is None:
+            summary['restored'] += 1
+            continue
+        summary['user_links'] += moved
+        summary['users'] += 1
+    stale = stale_links(timezone.now() - timedelta(days=days))
+    while batch := archive_batch(stale, ArchivedLink.INACTIVE, batch_size):
+        summary['links'] += batch
+    return summary
@@ -0,0 +1,68 @@
+import re
+from functools import lru_cache
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+# =============== Vendored Libraries ===============
+# name: (path under static/, upstream URL). `manage.py build_assets`
+# downloads them; until then templates fall back to the upstream URL.
+JSDELIVR = 'https://cdn.jsdelivr.net/npm'
+FONTAWESOME = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.2'
+VENDOR_ASSETS = {
+    'bootstrap.css': ('vendor/bootstrap/bootstrap.min.css', f'{JSDELIVR}/bootstrap@5.3.1/dist/css/bootstrap.min.css'),
+    'bootstrap.js': ('vendor/bootstrap/bootstrap.bundle.min.js', f'{JSDELIVR}/bootstrap@5.3.1/dist/js/bootstrap.bundle.min.js'),
+    'fontawesome.css': ('vendor/fontawesome/css/all.min.css', f'{FONTAWESOME}/css/all.min.css'),
+    'ag-grid.css': ('vendor/ag-grid/ag-grid.css', f'{JSDELIVR}/ag-grid-community@31.2.1/styles/ag-grid.css'),
+    'ag-theme-alpine.css': ('vendor/ag-grid/ag-theme-alpine.css', f'{JSDELIVR}/ag-grid-community@31.2.1/styles/ag-theme-alpine.css'),
+    'ag-grid.js': ('vendor/ag-grid/ag-grid-community.min.noStyle.js', f'{JSDELIVR}/ag-grid-community@31.2.1/dist/ag-grid-community.min.noStyle.js'),
+    'sweetalert2.js': ('vendor/sweetalert2/sweetalert2.all.min.js', f'{JSDELIVR}/sweetalert2@11.10.5/dist/sweetalert2.all.min.js'),
+}
+# Font Awesome's CSS points at ../webfonts/; they must be present to hash it.
+for _font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility'):
+    for _ext in ('woff2', 'ttf'):
+        VENDOR_ASSETS[f'{_font}.{_ext}'] = (
+            f'vendor/fontawesome/webfonts/{_font}.{_ext}', f'{FONTAWESOME}/webfonts/{_font}.{_ext}'
+        )
+
+
+@lru_cache(maxsize=None)
+def vendor_url(name):
+    path, upstream = VENDOR_ASSETS[name]
+    if finders.find(path):
+        return static(path)
+    return upstream
+
+# =============== Minification ===============
+# Deliberately conservative: enough for our hand-written files, which are
+# small; vendored libraries ship minified already.
+SOURCE_MAP = re.compile(r'/\*# sourceMappingURL=[^*]*\*/|//# sourceMappingURL=\S*')
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+
+def strip_source_maps(text):
+    return SOURCE_MAP.sub('', text)
+
+
+def minify_css(text):
+    text = CSS_COMMENT.sub('', text)
+    text = re.sub(r'\s+', ' ', text)
+    return CSS_PUNCTUATION.sub(r'\1', text).replace(';}', '}').strip()
+
+
+def minify_js(text):
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def is_minifiable(name):
+    # Only our own static/css and static/js; app and vendored assets are left alone.
+    return name.startswith(('css/', 'js/')) and name.endswith(('.css', '.js')) and '.min.' not in name
+
+
+def minify(name, text):
+    return minify_css(text) if name.endswith('.css') else minify_js(text)
@@ -0,0 +1,73 @@
+from calendar import isleap
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Q
+from .caching import model_state
+from .models import UserProfile
+from .utils import leap_yday
+
+# =============== Birthday Keys ===============
+# UserProfile.dob_yday is the birthday's day of the year in a leap year
+# (utils.leap_yday), so every month/day has one fixed key and "the next N
+# days" becomes one key range, or two when the window wraps past Dec 31.
+FEB_28 = leap_yday(2, 28)
+FEB_29 = leap_yday(2, 29)
+
+
+def yday_ranges(start, end):
+    """Inclusive dob_yday ranges covering birthdays celebrated from `start` to `end`."""
+    if (end - start).days >= 365:
+        return [(1, 366)]
+    first = leap_yday(start.month, start.day)
+    last = leap_yday(end.month, end.day)
+    # Outside leap years, Feb 29 birthdays are celebrated on Feb 28.
+    if last == FEB_28 and not isleap(end.year):
+        last = FEB_29
+    if first <= last:
+        return [(first, last)]
+    return [(first, 366), (1, last)]
+
+
+def celebrated_on(dob, year):
+    if dob.month == 2 and dob.day == 29 and not isleap(year):
+        return date(year, 2, 28)
+    return date(year, dob.month, dob.day)
+
+
+def next_birthday(dob, today):
+    """The first date on or after `today` that celebrates `dob`."""
+    day = celebrated_on(dob, today.year)
+    return day if day >= today else celebrated_on(dob, today.year + 1)
+
+# =============== Upcoming Birthdays ===============
+BIRTHDAY_FIELDS = ('user_id', 'name', 'dob')
+BIRTHDAYS_KEY = 'birthdays:{}:{}:{}'
+BIRTHDAYS_TIMEOUT = 24 * 60 * 60
+
+
+def upcoming_birthdays(today, days):
+    """
+    Profiles with a birthday from `today` to `days` later, soonest first.
+    Cached per day and per User/UserProfile version, so repeats don't query.
+    """
+    versions = ':'.join(str(model_state(model)[0]) for model in (UserProfile, User))
+    key = BIRTHDAYS_KEY.format(today.isoformat(), days, versions)
+    rows = cache.get(key)
+    if rows is not None:
+        return rows
+    keys = Q()
+    for first, last in yday_ranges(today, today + timedelta(days=days)):
+        keys |= Q(dob_yday__gte=first, dob_yday__lte=last)
+    rows = []
+    for row in UserProfile.objects.filter(keys, user__is_active=True).values(*BIRTHDAY_FIELDS):
+        birthday = next_birthday(row['dob'], today)
+        rows.append({
+            **row,
+            'birthday': birthday,
+            'days_until': (birthday - today).days,
+            'turning': birthday.year - row['dob'].year,
+        })
+    rows.sort(key=lambda row: (row['days_until'], row['name'] or '', row['user_id']))
+    cache.set(key, rows, BIRTHDAYS_TIMEOUT)
+    return rows
@@ -0,0 +1,229 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+# =============== Model Versions ===============
+# Each model has a version counter and a last-modified time in the cache.
+# Signals bump them on writes; readers compare them instead of the table.
+# With LocMemCache the versions are per process, so use a shared (file or
+# network) cache when running several workers.
+VERSION_KEY = 'model-version:{}'
+MODIFIED_KEY = 'model-modified:{}'
+VIEW_CACHE_TIMEOUT = 300
+
+
+def state_keys(model):
+    label = model._meta.label_lower
+    return VERSION_KEY.format(label), MODIFIED_KEY.format(label)
+
+
+def has_updated_at(model):
+    return any(field.name == 'updated_at' for field in model._meta.get_fields())
+
+
+def model_state(model):
+    keys = state_keys(model)
+    state = cache.get_many(keys)
+    if len(state) == 2:
+        return state[keys[0]], state[keys[1]]
+
+    # Cold cache: seed the counter from the clock so it never repeats a value
+    # handed out before a restart, and take the real last-modified time.
+    modified = None
+    if has_updated_at(model):
+        modified = model._default_manager.aggregate(modified=Max('updated_at'))['modified']
+    modified = (modified or timezone.now()).timestamp()
+    cache.add(keys[0], time.time_ns(), None)
+    cache.add(keys[1], modified, None)
+    state = cache.get_many(keys)
+    return state.get(keys[0], 0), state.get(keys[1], modified)
+
+
+async def amodel_state(model):
+    keys = state_keys(model)
+    state = await cache.aget_many(keys)
+    if len(state) == 2:
+        return state[keys[0]], state[keys[1]]
+
+    modified = None
+    if has_updated_at(model):
+        modified = (await model._default_manager.aaggregate(modified=Max('updated_at')))['modified']
+    modified = (modified or timezone.now()).timestamp()
+    await cache.aadd(keys[0], time.time_ns(), None)
+    await cache.aadd(keys[1], modified, None)
+    state = await cache.aget_many(keys)
+    return state.get(keys[0], 0), state.get(keys[1], modified)
+
+
+def bump_version(model, modified=None):
+    label = model._meta.label_lower
+    key = VERSION_KEY.format(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    cache.set(MODIFIED_KEY.format(label), (modified or timezone.now()).timestamp(), None)
+
+
+# =============== In-Process LRU ===============
+MISSING = object()
+
+
+class LocalLRU:
+    """Bounded, thread-safe LRU whose entries expire `ttl` seconds after being set."""
+
+    def __init__(self, size, ttl, clock=time.monotonic):
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return MISSING
+            value, expires = item
+            if expires < self.clock():
+                del self.items[key]
+                return MISSING
+            self.items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = (value, self.clock() + self.ttl)
+            self.items.move_to_end(key)
+            if len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+# =============== Versioned Views ===============
+def conditional_keys(request, states):
+    """Return (etag, last_modified, data cache key) for `request`."""
+    versions = ':'.join(str(version) for version, _ in states)
+    last_modified = int(max(modified for _, modified in states))
+    path = request.get_full_path()
+    digest = hashlib.md5(
+        f'{versions}|{path}|{request.META.get("HTTP_ACCEPT", "")}'.encode()
+    ).hexdigest()
+    key = 'view-cache:' + hashlib.md5(f'{versions}|{path}'.encode()).hexdigest()
+    return quote_etag(digest), last_modified, key
+
+
+def finish_response(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def versioned_cache(*models, timeout=VIEW_CACHE_TIMEOUT):
+    """
+    Cache a DRF view's `response.data` under the versions of `models`.
+
+    Requests carrying a matching If-None-Match / If-Modified-Since get a
+    304 straight from the cached versions, without touching the ORM.
+    Works on sync and async views.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view(request, *args, **kwargs)
+                states = [await amodel_state(model) for model in models]
+                etag, last_modified, key = conditional_keys(request, states)
+                not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if not_modified is not None:
+                    return not_modified
+                data = await cache.aget(key)
+                if data is None:
+                    response = await view(request, *args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                    await cache.aset(key, response.data, timeout)
+                else:
+                    response = Response(data)
+                return finish_response(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            states = [model_state(model) for model in models]
+            etag, last_modified, key = conditional_keys(request, states)
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+            data = cache.get(key)
+            if data is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                cache.set(key, response.data, timeout)
+            else:
+                response = Response(data)
+            return finish_response(response, etag, last_modified)
+        return wrapper
+    return decorator
+
+
+# =============== Anonymous Pages ===============
+ANON_PAGE_KEY = 'anon-page:{}'
+ANON_PAGE_TIMEOUT = 300
+CSRF_INPUT = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+CSRF_PLACEHOLDER = b'__csrf_token__'
+
+
+def anonymous_page_cache(timeout=ANON_PAGE_TIMEOUT):
+    """
+    Cache a page's HTML for anonymous GETs.
+
+    CSRF form tokens are swapped for a placeholder before caching and for
+    the visitor's own token when served. Visitors with pending flash
+    messages get a fresh render.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+                or request.COOKIES.get(CookieStorage.cookie_name)
+            ):
+                return view(request, *args, **kwargs)
+            key = ANON_PAGE_KEY.format(hashlib.md5(request.get_full_path().encode()).hexdigest())
+            page = cache.get(key)
+            if page is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming or response.cookies:
+                    return response
+                content = CSRF_INPUT.sub(rb'\1' + CSRF_PLACEHOLDER + rb'\2', response.content)
+                cache.set(key, (content, response['Content-Type']), timeout)
+                return response
+            content, content_type = page
+            if CSRF_PLACEHOLDER in content:
+                content = content.replace(CSRF_PLACEHOLDER, get_token(request).encode())
+            return HttpResponse(content, content_type=content_type)
+        return wrapper
+    return decorator
@@ -0,0 +1,48 @@
+from django.db.models import OuterRef, Subquery
+from .models import ChangeLog, LinkRegistry, UserProfile
+
+# =============== Change Feed ===============
+# Entries carry the full row, so a client that missed intermediate
+# updates only needs the latest one. With SQLite's single writer, commit
+# order matches `seq`, so polling with ?since=<last seq> never skips rows.
+TRACKED = {LinkRegistry: 'link', UserProfile: 'profile'}
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 5000
+
+
+def snapshot(instance):
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def entry(instance, action):
+    return ChangeLog(
+        kind=TRACKED[type(instance)], object_id=instance.pk, action=action,
+        data=None if action == ChangeLog.DELETE else snapshot(instance),
+    )
+
+
+def record(instance, action):
+    entry(instance, action).save()
+
+
+def record_many(instances, action):
+    """For bulk_create/bulk_update/update() paths, which send no signals."""
+    ChangeLog.objects.bulk_create([entry(instance, action) for instance in instances], batch_size=1000)
+
+
+def changes_since(since, limit):
+    rows = list(ChangeLog.objects.filter(seq__gt=since).order_by('seq')[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def compact(through_seq):
+    """
+    Drop entries up to `through_seq` that a newer entry for the same object
+    supersedes. Tombstones are the newest entry of a deleted object, so
+    they are kept and deletes stay visible to every client.
+    """
+    latest = ChangeLog.objects.filter(
+        kind=OuterRef('kind'), object_id=OuterRef('object_id')
+    ).order_by('-seq').values('seq')[:1]
+    deleted, _ = ChangeLog.objects.filter(seq__lte=through_seq, seq__lt=Subquery(latest)).delete()
+    return deleted
@@ -0,0 +1,212 @@
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import EmailValidator, URLValidator
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import UserProfile, LinkRegistry
+from .utils import phone_validator, pincode_validator
+
+# =============== Dataset Columns ===============
+# Export and import share these columns, so an export can be re-imported.
+DATASETS = {
+    'profiles': (UserProfile, (
+        'user__username', 'name', 'dob', 'email', 'phone', 'address', 'pincode',
+        'latitude', 'longitude',
+    )),
+    'links': (LinkRegistry, (
+        'user__username', 'link_name', 'link_url', 'active', 'created_at', 'updated_at',
+    )),
+}
+EXPORT_CHUNK_SIZE = 2000
+STREAM_BUFFER_BYTES = 64 * 1024
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def columns(dataset):
+    return [field.split('__')[-1] for field in DATASETS[dataset][1]]
+
+# =============== Export ===============
+class Echo:
+    """File-like object for csv.writer that hands back what it is given."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(dataset, queryset=None):
+    model, fields = DATASETS[dataset]
+    queryset = model.objects.all() if queryset is None else queryset
+    return queryset.order_by('id').values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def buffered(lines):
+    # Group rows into ~64KB chunks rather than one write per row.
+    chunk, size = [], 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= STREAM_BUFFER_BYTES:
+            yield ''.join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def export_value(value):
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def csv_lines(dataset, queryset=None):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns(dataset))
+    for row in export_rows(dataset, queryset):
+        yield writer.writerow(['' if value is None else export_value(value) for value in row])
+
+
+def ndjson_lines(dataset, queryset=None):
+    names = columns(dataset)
+    for row in export_rows(dataset, queryset):
+        yield json.dumps(dict(zip(names, map(export_value, row)))) + '\n'
+
+# =============== Import ===============
+def read_rows(path, fmt):
+    """Yield (line number, row dict) from a CSV or NDJSON file."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if fmt == 'csv':
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_no, json.loads(line)
+
+
+def text(row, key):
+    value = row.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def run_validator(validator, value, field, errors):
+    if value is None:
+        return
+    try:
+        validator(value)
+    except ValidationError as exc:
+        errors.append(f"{field}: {' '.join(exc.messages)}")
+
+
+def coordinate(row, key, limit, errors):
+    value = text(row, key)
+    if value is None:
+        return None
+    try:
+        number = Decimal(value).quantize(Decimal('0.000001'))
+    except InvalidOperation:
+        errors.append(f"{key}: not a number")
+        return None
+    if abs(number) > limit:
+        errors.append(f"{key}: out of range")
+    return number
+
+
+def moment(row, key, errors):
+    value = text(row, key)
+    if value is None:
+        return None
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        errors.append(f"{key}: expected an ISO 8601 date and time")
+        return None
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+def clean_profile(row):
+    """Validated UserProfile fields plus 'username', or ValidationError."""
+    errors = []
+    username = text(row, 'username')
+    if not username:
+        errors.append("username: required")
+    else:
+        run_validator(User.username_validator, username, 'username', errors)
+    dob = text(row, 'dob')
+    if dob is not None:
+        try:
+            dob = parse_date(dob)
+        except ValueError:
+            dob = None
+        if dob is None:
+            errors.append("dob: expected YYYY-MM-DD")
+    email = text(row, 'email')
+    phone = text(row, 'phone')
+    pincode = text(row, 'pincode')
+    run_validator(EmailValidator(), email, 'email', errors)
+    run_validator(phone_validator, phone, 'phone', errors)
+    run_validator(pincode_validator, pincode, 'pincode', errors)
+    cleaned = {
+        'username': username,
+        'name': text(row, 'name'),
+        'dob': dob,
+        'email': email,
+        'phone': phone,
+        'address': text(row, 'address'),
+        'pincode': pincode,
+        'latitude': coordinate(row, 'latitude', 90, errors),
+        'longitude': coordinate(row, 'longitude', 180, errors),
+    }
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+
+def clean_link(row):
+    """
+    Validated LinkRegistry fields plus 'username', or ValidationError.
+    Blank created_at/updated_at are left as None for the import to fill.
+    """
+    errors = []
+    username = text(row, 'username')
+    link_name = text(row, 'link_name')
+    link_url = text(row, 'link_url')
+    if not username:
+        errors.append("username: required")
+    if not link_name:
+        errors.append("link_name: required")
+    elif len(link_name) > 100:
+        errors.append("link_name: longer than 100 characters")
+    if not link_url:
+        errors.append("link_url: required")
+    elif len(link_url) > 300:
+        errors.append("link_url: longer than 300 characters")
+    else:
+        run_validator(URLValidator(), link_url, 'link_url', errors)
+    active = row.get('active')
+    if isinstance(active, str):
+        active = active.strip().lower() in TRUE_VALUES if active.strip() else True
+    created_at = moment(row, 'created_at', errors)
+    updated_at = moment(row, 'updated_at', errors)
+    if errors:
+        raise ValidationError(errors)
+    return {
+        'username': username,
+        'link_name': link_name,
+        'link_url': link_url,
+        'active': True if active is None else bool(active),
+        'created_at': created_at,
+        'updated_at': updated_at,
+    }
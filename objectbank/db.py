@@ -0,0 +1,124 @@
+import queue
+import threading
+from concurrent.futures import Future
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from .caching import bump_version
+
+# =============== SQLite Tuning ===============
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=20000',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+)
+
+def apply_sqlite_pragmas(db_connection):
+    with db_connection.cursor() as cursor:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+
+# =============== Single Writer ===============
+class WriteQueue:
+    """
+    Runs write callables one at a time on a dedicated thread.
+
+    SQLite allows one writer at a time. Funnelling short writes through a
+    single connection turns lock contention ("database is locked") into a
+    queue, and tasks that arrive together share one commit; each task runs
+    in its own savepoint so a failing task does not undo the others.
+    """
+    max_batch = 64
+
+    def __init__(self, atomic=transaction.atomic, setup=close_old_connections):
+        self.atomic = atomic
+        self.setup = setup
+        self.tasks = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, func, *args, **kwargs):
+        self.start()
+        future = Future()
+        self.tasks.put((future, func, args, kwargs))
+        return future.result()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='sqlite-writer', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            batch = [self.tasks.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.tasks.get_nowait())
+                except queue.Empty:
+                    break
+            self.run_batch(batch)
+
+    def run_batch(self, batch):
+        self.setup()
+        outcomes = []
+        try:
+            with self.atomic():
+                for future, func, args, kwargs in batch:
+                    try:
+                        with self.atomic():
+                            outcomes.append((future, func(*args, **kwargs), None))
+                    except Exception as exc:
+                        outcomes.append((future, None, exc))
+        except Exception as exc:
+            for future, *_ in batch:
+                future.set_exception(exc)
+            return
+        for future, result, exc in outcomes:
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+
+write_queue = WriteQueue()
+
+def run_write(func, *args, **kwargs):
+    """Run `func` in a transaction, on the writer thread when it is enabled."""
+    if (
+        settings.SQLITE_WRITE_QUEUE
+        and connection.vendor == 'sqlite'
+        and not connection.in_atomic_block
+    ):
+        return write_queue.submit(func, *args, **kwargs)
+    with transaction.atomic():
+        return func(*args, **kwargs)
+
+# =============== Batched Backfills ===============
+def id_batches(queryset, batch_size):
+    """`queryset`'s rows, `batch_size` at a time in id order; keyset, not OFFSET."""
+    last_id = 0
+    while batch := list(queryset.filter(id__gt=last_id).order_by('id')[:batch_size]):
+        last_id = batch[-1].id
+        yield batch
+
+def backfill(queryset, fields, update, batch_size):
+    """
+    Call `update(row)` on every row of `queryset` and bulk_update the rows
+    whose `fields` it changed, a batch at a time. Returns how many changed.
+    """
+    updated = 0
+    for batch in id_batches(queryset, batch_size):
+        changed = []
+        for row in batch:
+            before = [getattr(row, field) for field in fields]
+            update(row)
+            if [getattr(row, field) for field in fields] != before:
+                changed.append(row)
+        queryset.model.objects.bulk_update(changed, fields)
+        updated += len(changed)
+    if updated:
+        # bulk_update sends no signals.
+        bump_version(queryset.model)
+    return updated
@@ -0,0 +1,84 @@
+import math
+import numpy as np
+
+# =============== Geohash ===============
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def cell_bits(precision):
+    # Bits alternate starting with longitude, so longitude gets the odd one.
+    total = 5 * precision
+    return total // 2, total - total // 2
+
+
+def encode_cell(lat_index, lng_index, precision):
+    lat_bits, lng_bits = cell_bits(precision)
+    code = 0
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            lng_bits -= 1
+            code = (code << 1) | ((lng_index >> lng_bits) & 1)
+        else:
+            lat_bits -= 1
+            code = (code << 1) | ((lat_index >> lat_bits) & 1)
+    return ''.join(
+        GEOHASH_ALPHABET[(code >> shift) & 31]
+        for shift in range(5 * (precision - 1), -1, -5)
+    )
+
+
+def cell_index(lat, lng, precision):
+    lat_bits, lng_bits = cell_bits(precision)
+    lat_index = min(int((lat + 90) / 180 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    lng_index = math.floor((lng + 180) / 360 * (1 << lng_bits)) % (1 << lng_bits)
+    return lat_index, lng_index
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+    return encode_cell(*cell_index(lat, lng, precision), precision)
+
+
+# =============== Proximity ===============
+def bounding_box(lat, lng, radius_km):
+    """Return (min_lat, max_lat, min_lng, max_lng); longitudes may pass ±180."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(lat - delta_lat, -90.0), min(lat + delta_lat, 90.0)
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+    if cos_lat <= 0 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+        return min_lat, max_lat, -180.0, 180.0
+    delta_lng = radius_km / (KM_PER_DEGREE * cos_lat)
+    return min_lat, max_lat, lng - delta_lng, lng + delta_lng
+
+
+def covering_cells(min_lat, max_lat, min_lng, max_lng, max_cells=16):
+    """
+    Geohash prefixes of the finest precision whose cells cover the box
+    with at most `max_cells` cells.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_bits, lng_bits = cell_bits(precision)
+        lat_start, _ = cell_index(min_lat, min_lng, precision)
+        lat_end, _ = cell_index(max_lat, max_lng, precision)
+        lng_start = math.floor((min_lng + 180) / 360 * (1 << lng_bits))
+        lng_end = math.floor((max_lng + 180) / 360 * (1 << lng_bits))
+        lng_count = min(lng_end - lng_start + 1, 1 << lng_bits)
+        if (lat_end - lat_start + 1) * lng_count <= max_cells:
+            return sorted({
+                encode_cell(lat_index, (lng_start + offset) % (1 << lng_bits), precision)
+                for lat_index in range(lat_start, lat_end + 1)
+                for offset in range(lng_count)
+            })
+    return ['']
+
+
+def haversine_km(lat, lng, lats, lngs):
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
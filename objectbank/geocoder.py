@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from functools import lru_cache
+import numpy as np
+from django.conf import settings
+
+# =============== Pincode Geocoder ===============
+# settings.PINCODE_DATASET is a .npy array of (pincode, lat, lng) records
+# sorted by pincode, built by `manage.py build_pincode_index`. It is opened
+# memory-mapped, so processes share the page cache instead of each holding
+# a copy, and a lookup is a binary search touching ~15 records. Coordinates
+# are integer microdegrees: exact to the 6 places UserProfile stores.
+PINCODE_DTYPE = np.dtype([('pincode', '<u8'), ('lat', '<i4'), ('lng', '<i4')])
+MICRODEGREES = 1_000_000
+# How often to look for a rebuilt dataset file.
+RELOAD_CHECK_SECONDS = 1.0
+
+
+def pincode_key(pincode):
+    """A pincode as the integer it is stored under, or None unless it is 6 digits."""
+    # Keys drop leading zeros: without the length check "0560002" would find 560002.
+    pincode = str(pincode or '').strip()
+    return int(pincode) if len(pincode) == 6 and pincode.isascii() and pincode.isdigit() else None
+
+
+class PincodeGeocoder:
+    def __init__(self, path, clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.codes = None
+        self.lats = self.lngs = None
+        self.loaded_mtime = None
+        self.checked_at = None
+        self.lock = threading.Lock()
+
+    def table(self):
+        """The memory-mapped pincode column, reopened when the file is rebuilt; None if absent."""
+        now = self.clock()
+        if self.checked_at is not None and now - self.checked_at < RELOAD_CHECK_SECONDS:
+            return self.codes
+        with self.lock:
+            self.checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except (OSError, TypeError):
+                mtime = None
+            if mtime != self.loaded_mtime:
+                records = np.load(self.path, mmap_mode='r') if mtime is not None else None
+                self.codes = None if records is None else records['pincode']
+                self.lats = None if records is None else records['lat']
+                self.lngs = None if records is None else records['lng']
+                self.loaded_mtime = mtime
+        return self.codes
+
+    def lookup(self, pincode):
+        """(lat, lng) of `pincode`, or None if it is unknown."""
+        key = pincode_key(pincode)
+        codes = self.table()
+        if key is None or codes is None:
+            return None
+        position = int(codes.searchsorted(np.uint64(key)))
+        if position == len(codes) or codes[position] != key:
+            return None
+        return self.coordinates(position)
+
+    def lookup_many(self, pincodes):
+        """lookup() for a batch, in one vectorized search."""
+        keys = [pincode_key(pincode) for pincode in pincodes]
+        codes = self.table()
+        if codes is None or not len(codes):
+            return [None] * len(keys)
+        wanted = np.array([key or 0 for key in keys], dtype='<u8')
+        positions = np.minimum(codes.searchsorted(wanted), len(codes) - 1)
+        found = codes[positions] == wanted
+        return [
+            self.coordinates(position) if key is not None and hit else None
+            for key, position, hit in zip(keys, positions, found)
+        ]
+
+    def coordinates(self, position):
+        return int(self.lats[position]) / MICRODEGREES, int(self.lngs[position]) / MICRODEGREES
+
+
+pincode_geocoder = PincodeGeocoder(settings.PINCODE_DATASET)
+
+
+def geocode(pincode):
+    """Centroid (lat, lng) of `pincode`, or None; cached per dataset build."""
+    key = pincode_key(pincode)
+    if key is None or pincode_geocoder.table() is None:
+        return None
+    return cached_lookup(key, pincode_geocoder.loaded_mtime)
+
+
+@lru_cache(maxsize=4096)
+def cached_lookup(key, dataset_version):
+    return pincode_geocoder.lookup(key)
+
+
+def write_dataset(path, pincodes, lats, lngs):
+    """
+    Average duplicate pincodes into centroids and atomically replace `path`.
+    Returns the number of distinct pincodes written.
+    """
+    pincodes = np.asarray(pincodes, dtype='<u8')
+    codes, inverse, counts = np.unique(pincodes, return_inverse=True, return_counts=True)
+    records = np.empty(len(codes), dtype=PINCODE_DTYPE)
+    records['pincode'] = codes
+    for column, values in (('lat', lats), ('lng', lngs)):
+        centroids = np.bincount(inverse, weights=np.asarray(values, dtype=float)) / counts
+        records[column] = np.rint(centroids * MICRODEGREES)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Replace rather than overwrite, so open memory maps keep the old file.
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as handle:
+        np.save(handle, records)
+    os.replace(tmp, path)
+    return len(codes)
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from dataclasses import dataclass
+import aiohttp
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .caching import bump_version
+from .changes import record_many
+from .models import ChangeLog, LinkHealth, LinkRegistry
+from . import shortlinks
+
+# =============== Link Health Checks ===============
+HEAD_UNSUPPORTED = (405, 501)
+
+
+@dataclass
+class CheckResult:
+    link_id: int
+    ok: bool
+    status_code: int = None
+    latency_ms: float = None
+    error: str = ''
+    etag: str = ''
+    last_modified: str = ''
+
+
+class LinkChecker:
+    """
+    Checks LinkRegistry URLs concurrently with aiohttp.
+
+    HEAD first (GET when the server refuses HEAD), revalidating with the
+    ETag/Last-Modified of the previous check. Connections are capped overall
+    and per host. A link that fails `failure_threshold` checks in a row is
+    set inactive and flagged; a flagged link that answers again is restored.
+    """
+    concurrency = 100
+    per_host = 8
+    timeout = 10.0
+    failure_threshold = 3
+    user_agent = 'objectbank-linkcheck/1.0'
+
+    def __init__(self, concurrency=None, per_host=None, timeout=None, failure_threshold=None):
+        self.concurrency = concurrency or self.concurrency
+        self.per_host = per_host or self.per_host
+        self.timeout = timeout or self.timeout
+        self.failure_threshold = failure_threshold or self.failure_threshold
+
+    def links(self):
+        """Active links, plus the ones we switched off ourselves."""
+        return LinkRegistry.objects.filter(Q(active=True) | Q(health__flagged=True))
+
+    def run(self, queryset=None):
+        queryset = self.links() if queryset is None else queryset
+        rows = list(queryset.values_list('id', 'link_url', 'health__etag', 'health__last_modified'))
+        results = asyncio.run(self.check_all(rows))
+        return self.save(results)
+
+    async def check_all(self, rows):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        # sock_* timeouts leave out time spent queued for a pooled connection.
+        timeout = aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers={'User-Agent': self.user_agent}
+        ) as session:
+            return await asyncio.gather(*(self.check(session, *row) for row in rows))
+
+    async def check(self, session, link_id, url, etag=None, last_modified=None):
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        start = time.perf_counter()
+        try:
+            async with session.head(url, headers=headers, allow_redirects=True) as response:
+                status, response_headers = response.status, response.headers
+            if status in HEAD_UNSUPPORTED:
+                # The body is never read; the connection is closed instead.
+                async with session.get(url, headers=headers, allow_redirects=True) as response:
+                    status, response_headers = response.status, response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+            return CheckResult(
+                link_id, False, latency_ms=self.elapsed(start),
+                error=(str(exc) or exc.__class__.__name__)[:200],
+            )
+        return CheckResult(
+            link_id, status < 400, status, self.elapsed(start),
+            error='' if status < 400 else f'HTTP {status}',
+            # A 304 carries no validators of its own; keep the ones we sent.
+            etag=response_headers.get('ETag', etag or '')[:200],
+            last_modified=response_headers.get('Last-Modified', last_modified or '')[:64],
+        )
+
+    def elapsed(self, start):
+        return round((time.perf_counter() - start) * 1000, 3)
+
+    def save(self, results):
+        """Store `results` and flip `active` on links that crossed the threshold."""
+        now = timezone.now()
+        existing = LinkHealth.objects.in_bulk([result.link_id for result in results])
+        created, updated, flag, restore = [], [], [], []
+        for result in results:
+            health = existing.get(result.link_id)
+            if health is None:
+                health = LinkHealth(link_id=result.link_id)
+                created.append(health)
+            else:
+                updated.append(health)
+            health.ok = result.ok
+            health.status_code = result.status_code
+            health.latency_ms = result.latency_ms
+            health.error = result.error
+            health.etag = result.etag
+            health.last_modified = result.last_modified
+            health.checked_at = now
+            health.failures = 0 if result.ok else health.failures + 1
+            if result.ok and health.flagged:
+                health.flagged = False
+                restore.append(result.link_id)
+            elif not health.flagged and health.failures >= self.failure_threshold:
+                health.flagged = True
+                flag.append(result.link_id)
+
+        with transaction.atomic():
+            LinkHealth.objects.bulk_create(created, batch_size=1000)
+            LinkHealth.objects.bulk_update(updated, [
+                'ok', 'status_code', 'latency_ms', 'error', 'etag', 'last_modified',
+                'failures', 'flagged', 'checked_at',
+            ], batch_size=1000)
+            # update() leaves updated_at alone, so the grid's ordering is stable.
+            LinkRegistry.objects.filter(id__in=flag).update(active=False)
+            restore = self.restorable(restore)
+            LinkRegistry.objects.filter(id__in=restore).update(active=True)
+            if flag or restore:
+                record_many(LinkRegistry.objects.filter(id__in=flag + restore), ChangeLog.UPDATE)
+                transaction.on_commit(lambda: bump_version(LinkRegistry))
+                transaction.on_commit(shortlinks.invalidate)
+
+        return {
+            'checked': len(results),
+            'ok': sum(1 for result in results if result.ok),
+            'failed': sum(1 for result in results if not result.ok),
+            'flagged': len(flag),
+            'restored': len(restore),
+        }
+
+    def restorable(self, ids):
+        """The subset of `ids` whose name no active link has taken meanwhile."""
+        candidates = list(LinkRegistry.objects.filter(id__in=ids).values_list('id', 'link_name'))
+        taken = set(LinkRegistry.objects.filter(
+            active=True, link_name__in=[name for _, name in candidates]
+        ).values_list('link_name', flat=True))
+        restorable = []
+        for link_id, name in candidates:
+            if name not in taken:
+                taken.add(name)
+                restorable.append(link_id)
+        return restorable
@@ -0,0 +1,30 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ... import archive
+
+class Command(BaseCommand):
+    help = "Moves inactive links and deleted users' data into the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help="Archive links inactive for longer than this")
+        parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Seconds between passes; 0 runs once and exits")
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                started = time.perf_counter()
+                summary = archive.run(options["days"], options["batch_size"])
+                self.stdout.write(self.style.SUCCESS(
+                    f"Archived {summary['links']} inactive links and {summary['users']} deleted users "
+                    f"({summary['user_links']} links), restored {summary['restored']} reactivated users, "
+                    f"in {time.perf_counter() - started:.2f}s."
+                ))
+                if not options["interval"]:
+                    return
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from ...db import backfill
+from ...models import UserProfile
+
+class Command(BaseCommand):
+    help = "Fills UserProfile.dob_yday for existing rows in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        updated = backfill(
+            UserProfile.objects.only("id", "dob", "dob_yday"),
+            ["dob_yday"], UserProfile.update_dob_yday, options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Updated dob_yday on {updated} profiles."))
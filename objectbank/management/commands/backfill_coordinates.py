@@ -0,0 +1,41 @@
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from ...caching import bump_version
+from ...changes import record_many
+from ...db import id_batches
+from ...geocoder import pincode_geocoder
+from ...models import ChangeLog, UserProfile
+
+class Command(BaseCommand):
+    help = "Fills missing UserProfile coordinates from the offline pincode geocoder, in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if pincode_geocoder.table() is None:
+            raise CommandError(f"No pincode dataset at {pincode_geocoder.path}; run build_pincode_index first.")
+        batch_size = options["batch_size"]
+        missing = UserProfile.objects.filter(latitude__isnull=True, longitude__isnull=True, pincode__isnull=False)
+        updated, unknown = 0, 0
+        for batch in id_batches(missing, batch_size):
+            changed = []
+            centroids = pincode_geocoder.lookup_many([profile.pincode for profile in batch])
+            for profile, centroid in zip(batch, centroids):
+                if centroid is None:
+                    unknown += 1
+                    continue
+                profile.latitude, profile.longitude = (Decimal(str(value)) for value in centroid)
+                profile.update_geohash()
+                changed.append(profile)
+            with transaction.atomic():
+                UserProfile.objects.bulk_update(changed, ["latitude", "longitude", "geohash"])
+                # bulk_update sends no signals.
+                record_many(changed, ChangeLog.UPDATE)
+            updated += len(changed)
+        if updated:
+            bump_version(UserProfile)
+        self.stdout.write(self.style.SUCCESS(
+            f"Geocoded {updated} profiles; {unknown} pincodes were not in the dataset."
+        ))
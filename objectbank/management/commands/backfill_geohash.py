@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from ...db import backfill
+from ...models import UserProfile
+
+class Command(BaseCommand):
+    help = "Fills UserProfile.geohash for existing rows in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        updated = backfill(
+            UserProfile.objects.only("id", "latitude", "longitude", "geohash"),
+            ["geohash"], UserProfile.update_geohash, options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Updated geohash on {updated} profiles."))
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.urls import include, path
+from ...api_urls import api_patterns
+from ...models import LinkRegistry
+
+ENDPOINTS = ('/api/', '/api/items/', '/api/users/', '/api/links/?page_size=50')
+HEADERS = {'accept': 'application/json'}
+
+
+def urlconf(asynchronous):
+    module = types.ModuleType(f'bench_urls_{"async" if asynchronous else "sync"}')
+    module.urlpatterns = [path('api/', include(api_patterns(asynchronous)))]
+    return module
+
+
+class Command(BaseCommand):
+    help = "Compares the sync (WSGI) and async (ASGI) JSON endpoints under concurrent load"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--wsgi-threads", type=int, default=8)
+        parser.add_argument("--links", type=int, default=500)
+
+    def handle(self, *args, **options):
+        # Request threads open their own connections, so rolling back a
+        # transaction would hide the links from them; the run gets a
+        # throwaway database instead of writing to the live one.
+        test_settings = connection.settings_dict["TEST"]
+        with tempfile.TemporaryDirectory() as directory:
+            connection.settings_dict["TEST"] = {**test_settings, "NAME": os.path.join(directory, "bench.sqlite3")}
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                runs = self.run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                connection.settings_dict["TEST"] = test_settings
+        for name, result in runs.items():
+            self.stdout.write(json.dumps({"mode": name, **result}))
+
+    def run(self, options):
+        user = User.objects.create(username="bench-async")
+        LinkRegistry.objects.bulk_create(
+            LinkRegistry(user=user, link_name=f"BENCH{i}", link_url=f"https://example.com/{i}")
+            for i in range(options["links"])
+        )
+        return {
+            "wsgi_sync_views": self.run_wsgi(options),
+            "asgi_sync_views": asyncio.run(self.run_asgi(False, options)),
+            "asgi_async_views": asyncio.run(self.run_asgi(True, options)),
+        }
+
+    def urls(self, total):
+        return [ENDPOINTS[i % len(ENDPOINTS)] for i in range(total)]
+
+    def summarize(self, latencies, elapsed, errors):
+        latencies.sort()
+        pick = lambda q: round(latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000, 2)
+        return {
+            "requests_per_sec": round(len(latencies) / elapsed, 1),
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "errors": errors,
+        }
+
+    def run_wsgi(self, options):
+        client = Client()
+
+        def fetch(url):
+            start = time.perf_counter()
+            status = client.get(url, headers=HEADERS).status_code
+            return time.perf_counter() - start, status
+
+        with override_settings(ROOT_URLCONF=urlconf(False)):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(options["wsgi_threads"]) as pool:
+                results = list(pool.map(fetch, self.urls(options["requests"])))
+            elapsed = time.perf_counter() - started
+        errors = sum(1 for _, status in results if status != 200)
+        return self.summarize([latency for latency, _ in results], elapsed, errors)
+
+    async def run_asgi(self, asynchronous, options):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def fetch(url):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(url, headers=HEADERS)
+                return time.perf_counter() - start, response.status_code
+
+        with override_settings(ROOT_URLCONF=urlconf(asynchronous)):
+            started = time.perf_counter()
+            results = await asyncio.gather(*(fetch(url) for url in self.urls(options["requests"])))
+            elapsed = time.perf_counter() - started
+        errors = sum(1 for _, status in results if status != 200)
+        return self.summarize([latency for latency, _ in results], elapsed, errors)
@@ -0,0 +1,86 @@
+import json
+import random
+import time
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from ...models import UserProfile
+from ...geo import haversine_km
+from ...search import nearby_profiles
+
+# Roughly the bounding box of India, where our users are.
+LAT_RANGE = (8.0, 37.0)
+LNG_RANGE = (68.0, 97.0)
+
+class Command(BaseCommand):
+    help = "Benchmarks /api/profiles/nearby against a full scan at several table sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000")
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--radius-km", type=float, default=5.0)
+        parser.add_argument("--k", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        results = []
+        for size in [int(x) for x in options["sizes"].split(",")]:
+            with transaction.atomic():
+                self.populate(size, rng)
+                points = [
+                    (rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE))
+                    for _ in range(options["queries"])
+                ]
+                indexed = self.time_queries(
+                    points, lambda lat, lng: nearby_profiles(lat, lng, options["radius_km"], options["k"])
+                )
+                scan = self.time_queries(
+                    points[:10], lambda lat, lng: self.full_scan(lat, lng, options["radius_km"], options["k"])
+                )
+                transaction.set_rollback(True)
+            results.append({"rows": size, "indexed_ms": indexed, "full_scan_ms": scan})
+            self.stdout.write(json.dumps(results[-1]))
+
+        first, last = results[0], results[-1]
+        growth = last["rows"] / first["rows"]
+        self.stdout.write(self.style.SUCCESS(
+            f"rows x{growth:g}: indexed p50 x{last['indexed_ms']['p50'] / first['indexed_ms']['p50']:.2f}, "
+            f"full scan p50 x{last['full_scan_ms']['p50'] / first['full_scan_ms']['p50']:.2f}"
+        ))
+
+    def populate(self, size, rng):
+        users = User.objects.bulk_create(
+            [User(username=f"bench-nearby-{size}-{i}", password="!") for i in range(size)],
+            batch_size=2000,
+        )
+        profiles = []
+        for user in users:
+            profile = UserProfile(
+                user=user,
+                name=user.username,
+                latitude=round(rng.uniform(*LAT_RANGE), 6),
+                longitude=round(rng.uniform(*LNG_RANGE), 6),
+            )
+            profile.update_geohash()
+            profiles.append(profile)
+        UserProfile.objects.bulk_create(profiles, batch_size=2000)
+
+    def full_scan(self, lat, lng, radius_km, k):
+        rows = list(UserProfile.objects.filter(latitude__isnull=False).values_list("latitude", "longitude"))
+        coords = np.array(rows, dtype=float)
+        distances = haversine_km(lat, lng, coords[:, 0], coords[:, 1])
+        return np.sort(distances[distances <= radius_km])[:k]
+
+    def time_queries(self, points, query):
+        timings = []
+        for lat, lng in points:
+            start = time.perf_counter()
+            query(lat, lng)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return {
+            "p50": round(timings[len(timings) // 2], 3),
+            "p95": round(timings[int(len(timings) * 0.95)], 3),
+        }
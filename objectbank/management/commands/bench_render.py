@@ -0,0 +1,70 @@
+import json
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from ...models import LinkRegistry
+from ...renderers import MessagePackRenderer, ORJSONRenderer
+from ...serializers import LinkRegistrySerializer, link_rows, link_values
+
+class Command(BaseCommand):
+    help = "Benchmarks link list serialization: ModelSerializer + JSONRenderer vs .values() + orjson/msgpack"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--page-size", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.populate(options["rows"])
+            queryset = LinkRegistry.objects.select_related("user").order_by("-updated_at", "-id")
+            page = options["page_size"]
+            paths = {
+                "serializer+json": lambda: JSONRenderer().render(
+                    LinkRegistrySerializer(queryset[:page], many=True).data
+                ),
+                "values+orjson": lambda: ORJSONRenderer().render(link_rows(link_values(queryset)[:page])),
+                "values+msgpack": lambda: MessagePackRenderer().render(link_rows(link_values(queryset)[:page])),
+            }
+            results = {name: self.time_path(render, page, options["repeat"]) for name, render in paths.items()}
+            transaction.set_rollback(True)
+
+        for name, result in results.items():
+            self.stdout.write(json.dumps({"path": name, **result}))
+        baseline = results["serializer+json"]["rows_per_sec"]
+        self.stdout.write(self.style.SUCCESS(", ".join(
+            f"{name} x{result['rows_per_sec'] / baseline:.1f}"
+            for name, result in results.items()
+        )))
+
+    def populate(self, rows):
+        users = User.objects.bulk_create(
+            [User(username=f"bench-render-{i}", password="!") for i in range(max(1, rows // 10))],
+            batch_size=2000,
+        )
+        LinkRegistry.objects.bulk_create(
+            [
+                LinkRegistry(
+                    user=users[i % len(users)],
+                    link_name=f"BENCH-RENDER-{i}",
+                    link_url=f"https://example.com/bench/{i}",
+                )
+                for i in range(rows)
+            ],
+            batch_size=2000,
+        )
+
+    def time_path(self, render, rows, repeat):
+        timings, size = [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            size = len(render())
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        return {
+            "best_ms": round(best * 1000, 3),
+            "rows_per_sec": round(rows / best),
+            "bytes": size,
+        }
@@ -0,0 +1,142 @@
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from django.core.management.base import BaseCommand
+from ...db import SQLITE_PRAGMAS, WriteQueue
+
+SCHEMA = (
+    "CREATE TABLE link (id INTEGER PRIMARY KEY, name TEXT, url TEXT, updated_at REAL)",
+    "CREATE TABLE counter (id INTEGER PRIMARY KEY, hits INTEGER)",
+    "INSERT INTO counter (id, hits) VALUES (1, 0)",
+)
+
+
+class SqliteAtomic:
+    """transaction.atomic() stand-in for a raw sqlite3 connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.depth = 0
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE" if self.depth == 0 else f"SAVEPOINT s{self.depth}")
+        self.depth += 1
+
+    def __exit__(self, exc_type, *exc):
+        self.depth -= 1
+        if self.depth == 0:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        else:
+            if exc_type:
+                self.conn.execute(f"ROLLBACK TO s{self.depth}")
+            self.conn.execute(f"RELEASE s{self.depth}")
+        return False
+
+
+def write(conn, n):
+    conn.execute(
+        "INSERT INTO link (name, url, updated_at) VALUES (?, ?, ?)",
+        (f"LINK{n}", f"https://example.com/{n}", time.time()),
+    )
+    conn.execute("UPDATE counter SET hits = hits + 1 WHERE id = 1")
+
+
+def read(conn):
+    return conn.execute("SELECT id, name, url FROM link ORDER BY id DESC LIMIT 20").fetchall()
+
+
+class Command(BaseCommand):
+    help = "Multi-threaded SQLite load test: default settings vs the concurrency mode"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--ops", type=int, default=300, help="Operations per thread")
+        parser.add_argument("--write-ratio", type=float, default=0.3)
+
+    def handle(self, *args, **options):
+        results = {}
+        for mode in ("default", "tuned"):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "bench.sqlite3")
+                conn = sqlite3.connect(path)
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+                conn.close()
+                results[mode] = self.run_load(mode, path, options)
+            self.stdout.write(json.dumps({"mode": mode, **results[mode]}))
+        speedup = results["tuned"]["ops_per_sec"] / results["default"]["ops_per_sec"]
+        self.stdout.write(self.style.SUCCESS(f"Throughput x{speedup:.2f} with the concurrency mode"))
+
+    def run_load(self, mode, path, options):
+        tuned = mode == "tuned"
+        writer = None
+        if tuned:
+            writer_conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            for pragma in SQLITE_PRAGMAS:
+                writer_conn.execute(pragma)
+            writer = WriteQueue(atomic=SqliteAtomic(writer_conn), setup=lambda: None)
+
+        latencies, errors = [], [0]
+        lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local, persistent = [], None
+            if tuned:
+                persistent = sqlite3.connect(path, isolation_level=None)
+                for pragma in SQLITE_PRAGMAS:
+                    persistent.execute(pragma)
+            for n in range(options["ops"]):
+                is_write = rng.random() < options["write_ratio"]
+                start = time.perf_counter()
+                try:
+                    if tuned:
+                        if is_write:
+                            writer.submit(write, writer_conn, n)
+                        else:
+                            read(persistent)
+                    else:
+                        # Django's defaults: a new connection per request,
+                        # rollback journal, deferred transactions, 5s timeout.
+                        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+                        try:
+                            if is_write:
+                                conn.execute("BEGIN")
+                                write(conn, n)
+                                conn.execute("COMMIT")
+                            else:
+                                read(conn)
+                        finally:
+                            conn.close()
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+                    continue
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options["threads"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        pick = lambda q: round(latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000, 3)
+        return {
+            "ops_per_sec": round(len(latencies) / elapsed, 1),
+            "p50_ms": pick(0.50),
+            "p99_ms": pick(0.99),
+            "errors": errors[0],
+        }
@@ -0,0 +1,146 @@
+import json
+import platform
+import subprocess
+import time
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from ...models import UserProfile, LinkRegistry
+from ...throttling import local_buckets
+
+HEADERS = {'accept': 'application/json'}
+# Every request comes from one client and user, so the real budgets would
+# turn most login/signup requests into 429s and time the throttle instead.
+UNTHROTTLED_RATE = '1000000000/second'
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Drives the main pages and APIs through the test client and reports latency as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--prefix", default="seed", help="Username prefix used by `seed`")
+        parser.add_argument("--password", default="seed-password")
+        parser.add_argument("--only", help="Comma-separated endpoint names")
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+        parser.add_argument("--throttle", action="store_true",
+                            help="Keep THROTTLE_RATES; by default the budgets are lifted for the run")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username__startswith=f"{options['prefix']}-").order_by("id").first()
+        if user is None:
+            raise CommandError(f"No '{options['prefix']}-*' users; run `manage.py seed` first.")
+        self.login_user = user.username
+        self.password = options["password"]
+        self.signups = []
+
+        # name: (request, expected status); login and signup redirect on success.
+        endpoints = {
+            "profiles_page": (lambda client, i: client.get("/profiles"), 200),
+            "links_api": (lambda client, i: client.get("/api/links/", headers=HEADERS), 200),
+            "users_api": (lambda client, i: client.get("/api/users/", headers=HEADERS), 200),
+            "login": (self.login, 302),
+            "signup": (self.signup, 302),
+        }
+        if options["only"]:
+            names = options["only"].split(",")
+            unknown = set(names) - set(endpoints)
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+            endpoints = {name: endpoints[name] for name in names}
+
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "rows": {
+                "users": User.objects.count(),
+                "profiles": UserProfile.objects.count(),
+                "links": LinkRegistry.objects.count(),
+            },
+            "requests_per_endpoint": options["requests"],
+            "throttling": "on" if options["throttle"] else "off (budgets lifted; pass --throttle to keep them)",
+            "endpoints": {},
+        }
+        if options["throttle"]:
+            rates, shared = settings.THROTTLE_RATES, settings.THROTTLE_SHARED
+        else:
+            rates, shared = {scope: UNTHROTTLED_RATE for scope in settings.THROTTLE_RATES}, False
+        try:
+            with override_settings(THROTTLE_RATES=rates, THROTTLE_SHARED=shared):
+                for name, (request, expected) in endpoints.items():
+                    local_buckets.clear()
+                    report["endpoints"][name] = self.run(request, expected, options["requests"], options["warmup"])
+        finally:
+            # Buckets keep the rate they were created with.
+            local_buckets.clear()
+            User.objects.filter(username__in=self.signups).delete()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output + "\n")
+        self.stdout.write(output)
+
+    def login(self, client, i):
+        client.cookies.clear()
+        return client.post("/login", {"username": self.login_user, "password": self.password})
+
+    def signup(self, client, i):
+        client.cookies.clear()
+        username = f"bench-signup-{time.time_ns()}-{i}"
+        self.signups.append(username)
+        return client.post("/signup", {
+            "username": username,
+            "password1": "Bench-pass-4821",
+            "password2": "Bench-pass-4821",
+            "name": "Bench User",
+            "email": f"{username}@example.com",
+            "phone": "+919876543210",
+            "pincode": "600001",
+        })
+
+    def run(self, request, expected, total, warmup):
+        client = Client()
+        for i in range(warmup):
+            request(client, -1 - i)
+
+        latencies, queries, errors = [], [], 0
+        started = time.perf_counter()
+        for i in range(total):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = request(client, i)
+                latencies.append(time.perf_counter() - start)
+            queries.append(len(captured))
+            if response.status_code != expected:
+                errors += 1
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        pick = lambda q: round(latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000, 3)
+        return {
+            "requests_per_sec": round(total / elapsed, 1),
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "p99_ms": pick(0.99),
+            "queries_per_request": round(sum(queries) / total, 2),
+            "max_queries": max(queries),
+            "errors": errors,
+        }
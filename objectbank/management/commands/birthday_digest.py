@@ -0,0 +1,83 @@
+import re
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from ...models import BirthdayDigest, TelegramOutbox
+from ...notifications import TELEGRAM_MAX_LENGTH, queue_telegram_message
+from ...birthdays import upcoming_birthdays
+
+DIGEST_KEY = 'birthday-digest:{}:{}'
+DIGEST_TIMEOUT = 2 * 24 * 60 * 60
+MARKDOWN_SPECIAL = re.compile(r'([_*`\[])')
+
+
+def escape(text):
+    return MARKDOWN_SPECIAL.sub(r'\\\1', str(text))
+
+
+def when(days_until):
+    if days_until == 0:
+        return "today"
+    if days_until == 1:
+        return "tomorrow"
+    return f"in {days_until} days"
+
+
+def render_digest(today, days, rows):
+    header = f"*Birthdays from {today:%d %b %Y} to {today + timedelta(days=days):%d %b}*"
+    if not rows:
+        return f"{header}\nNo birthdays coming up."
+    lines = [header]
+    length = len(header)
+    for shown, row in enumerate(rows):
+        line = f"{row['birthday']:%d %b} - {escape(row['name'] or row['user_id'])} turns {row['turning']} ({when(row['days_until'])})"
+        more = f"…and {len(rows) - shown} more"
+        # Always leave room for the "…and N more" line.
+        if length + len(line) + len(more) + 2 > TELEGRAM_MAX_LENGTH:
+            lines.append(more)
+            break
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+class Command(BaseCommand):
+    help = "Queues the upcoming birthdays for TELEGRAM_GROUPS, once a day"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument("--force", action="store_true", help="Queue again even if already queued today")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        days = options["days"]
+        # Every group gets the same text; a shared cache also spares reruns the render.
+        key = DIGEST_KEY.format(today.isoformat(), days)
+        text = cache.get(key)
+        if text is None:
+            text = render_digest(today, days, upcoming_birthdays(today, days))
+            cache.set(key, text, DIGEST_TIMEOUT)
+
+        if not settings.TELEGRAM_GROUPS:
+            self.stdout.write(text)
+            self.stdout.write(self.style.WARNING("No TELEGRAM_GROUPS configured; nothing posted."))
+            return
+
+        # A digest row per group and day makes the once-a-day check hold across
+        # cron runs and processes; the cache is per process. The outbox worker
+        # delivers the message, so a slow Telegram never blocks this command.
+        done = set(BirthdayDigest.objects.filter(day=today).exclude(
+            message__status=TelegramOutbox.FAILED,
+        ).values_list("chat_id", flat=True))
+        queued = 0
+        for index, chat_id in enumerate(settings.TELEGRAM_GROUPS):
+            if chat_id in done and not options["force"]:
+                continue
+            with transaction.atomic():
+                rows = queue_telegram_message(index, text)
+                BirthdayDigest.objects.update_or_create(day=today, chat_id=chat_id, defaults={"message": rows[0]})
+            queued += 1
+        self.stdout.write(self.style.SUCCESS(f"Queued the birthday digest for {queued} group(s)."))
@@ -0,0 +1,43 @@
+import csv
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...geocoder import pincode_key, write_dataset
+
+class Command(BaseCommand):
+    help = "Builds the offline pincode geocoder's dataset from a CSV of pincodes and coordinates"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV with a header row, e.g. the India Post pincode directory")
+        parser.add_argument("--pincode-column", default="pincode")
+        parser.add_argument("--lat-column", default="latitude")
+        parser.add_argument("--lng-column", default="longitude")
+        parser.add_argument("--output", default=settings.PINCODE_DATASET)
+
+    def handle(self, *args, **options):
+        columns = (options["pincode_column"], options["lat_column"], options["lng_column"])
+        pincodes, lats, lngs, skipped = [], [], [], 0
+        with open(options["path"], newline="", encoding="utf-8") as handle:
+            reader = csv.DictReader(handle)
+            missing = [column for column in columns if column not in (reader.fieldnames or ())]
+            if missing:
+                raise CommandError(f"Missing column(s): {', '.join(missing)}")
+            for row in reader:
+                key = pincode_key(row[columns[0]])
+                try:
+                    lat, lng = float(row[columns[1]]), float(row[columns[2]])
+                except (TypeError, ValueError):
+                    lat = lng = None
+                # Directories mark unknown coordinates as NA or 0.
+                if key is None or lat is None or not (-90 <= lat <= 90 and -180 <= lng <= 180) or lat == lng == 0:
+                    skipped += 1
+                    continue
+                pincodes.append(key)
+                lats.append(lat)
+                lngs.append(lng)
+        if not pincodes:
+            raise CommandError("No rows with a pincode and coordinates.")
+        written = write_dataset(options["output"], pincodes, lats, lngs)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} pincode centroids from {len(pincodes)} rows to {options['output']} "
+            f"({skipped} rows skipped)."
+        ))
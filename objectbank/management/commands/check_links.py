@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from ...linkcheck import LinkChecker
+
+class Command(BaseCommand):
+    help = "Checks LinkRegistry URLs concurrently and flags links that keep failing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=LinkChecker.concurrency)
+        parser.add_argument("--per-host", type=int, default=LinkChecker.per_host)
+        parser.add_argument("--timeout", type=float, default=LinkChecker.timeout)
+        parser.add_argument("--failures", type=int, default=LinkChecker.failure_threshold,
+                            help="Consecutive failures before a link is set inactive")
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Seconds between runs; 0 checks once and exits")
+
+    def handle(self, *args, **options):
+        checker = LinkChecker(
+            concurrency=options["concurrency"], per_host=options["per_host"],
+            timeout=options["timeout"], failure_threshold=options["failures"],
+        )
+        try:
+            while True:
+                started = time.perf_counter()
+                summary = checker.run()
+                self.stdout.write(self.style.SUCCESS(
+                    f"Checked {summary['checked']} links in {time.perf_counter() - started:.2f}s: "
+                    f"{summary['ok']} ok, {summary['failed']} failed, "
+                    f"{summary['flagged']} flagged, {summary['restored']} restored."
+                ))
+                if not options["interval"]:
+                    return
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
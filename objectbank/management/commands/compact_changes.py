@@ -0,0 +1,21 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+from ...changes import compact
+from ...models import ChangeLog
+
+class Command(BaseCommand):
+    help = "Drops change-feed entries superseded by a newer entry for the same object"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=float, default=7,
+                            help="Only compact entries older than this")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        through = ChangeLog.objects.filter(created_at__lt=cutoff).aggregate(seq=Max("seq"))["seq"]
+        deleted = compact(through) if through else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {deleted} superseded change entries; {ChangeLog.objects.count()} remain."
+        ))
@@ -0,0 +1,54 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.contrib.auth import password_validation
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from .import_data import Command as ImportCommand
+
+
+def init_worker():
+    # Workers started with "spawn" (macOS, Windows) need Django set up again.
+    django.setup()
+
+
+def hash_password(password):
+    return make_password(password or None)
+
+
+class Command(ImportCommand):
+    help = "Creates users and profiles from a CSV, hashing passwords on every core"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV with username,password and the profile columns")
+        parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                            help="Processes used for password hashing")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--show-errors", type=int, default=20)
+        parser.add_argument("--skip-password-validation", action="store_true")
+
+    def handle(self, *args, **options):
+        self.validate_passwords = not options["skip_password_validation"]
+        options.update(dataset="profiles", format="csv")
+        with ProcessPoolExecutor(options["workers"], initializer=init_worker) as pool:
+            self.pool = pool
+            self.workers = options["workers"]
+            super().handle(*args, **options)
+
+    def clean_profile(self, row):
+        cleaned = super().clean_profile(row)
+        # Kept as given: Django's password fields do not strip spaces either.
+        password = row.get("password") or None
+        if password and self.validate_passwords:
+            try:
+                password_validation.validate_password(password)
+            except ValidationError as exc:
+                raise ValidationError([f"password: {message}" for message in exc.messages])
+        cleaned["password"] = password
+        return cleaned
+
+    def hash_passwords(self, rows):
+        # Rows without a password get an unusable one (set it via reset).
+        passwords = [row.pop("password") for row in rows]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self.pool.map(hash_password, passwords, chunksize=chunksize))
@@ -0,0 +1,109 @@
+import random
+import time
+from datetime import date, timedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from ...caching import bump_version
+from ...changes import record_many
+from ...models import ChangeLog, UserProfile, LinkRegistry
+from ... import search
+
+# Roughly the bounding box of India, where our users are.
+LAT_RANGE = (8.0, 37.0)
+LNG_RANGE = (68.0, 97.0)
+FIRST_NAMES = ("Asha", "Ravi", "Meera", "Arjun", "Kavya", "Vikram", "Nisha", "Rahul", "Divya", "Suresh")
+LAST_NAMES = ("Sharma", "Iyer", "Reddy", "Patel", "Nair", "Gupta", "Singh", "Das", "Menon", "Rao")
+CITIES = ("Chennai", "Mumbai", "Delhi", "Bengaluru", "Kolkata", "Hyderabad", "Pune", "Jaipur")
+
+class Command(BaseCommand):
+    help = "Generates synthetic users, profiles and links with bulk inserts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--links", type=int, default=5000)
+        parser.add_argument("--prefix", default="seed")
+        parser.add_argument("--password", default="seed-password",
+                            help="Password for every seeded user (hashed once)")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--clear", action="store_true",
+                            help="Delete users with this prefix (and their rows) first")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        prefix = options["prefix"]
+        batch_size = options["batch_size"]
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            if options["clear"]:
+                doomed = User.objects.filter(username__startswith=f"{prefix}-")
+                search.unindex_profiles(
+                    UserProfile.objects.filter(user__in=doomed).values_list("pk", flat=True)
+                )
+                doomed.delete()
+            start = User.objects.filter(username__startswith=f"{prefix}-").count()
+
+            # One hash for everybody: hashing per row would dominate the run.
+            password = make_password(options["password"])
+            users = User.objects.bulk_create(
+                [
+                    User(username=f"{prefix}-{start + i}", password=password)
+                    for i in range(options["users"])
+                ],
+                batch_size=batch_size,
+            )
+            profiles = [self.profile(user, rng) for user in users]
+            UserProfile.objects.bulk_create(profiles, batch_size=batch_size)
+            # bulk_create sends no signals: update the search index and versions here.
+            search.index_profiles(profiles)
+            record_many(profiles, ChangeLog.CREATE)
+
+            owners = users or list(User.objects.filter(username__startswith=f"{prefix}-"))
+            # Continue after earlier runs' links: active names must be unique.
+            first_link = self.next_link_number(prefix)
+            links = []
+            for i in range(first_link, first_link + (options["links"] if owners else 0)):
+                link = LinkRegistry(
+                    user=rng.choice(owners),
+                    link_name=f"{prefix} link {i}",
+                    link_url=f"https://example.com/{prefix}/{i}",
+                    active=rng.random() < 0.9,
+                )
+                link.normalize()
+                links.append(link)
+            LinkRegistry.objects.bulk_create(links, batch_size=batch_size)
+            record_many(links, ChangeLog.CREATE)
+
+            transaction.on_commit(lambda: bump_version(User))
+            transaction.on_commit(lambda: bump_version(UserProfile))
+            transaction.on_commit(lambda: bump_version(LinkRegistry))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users/profiles and {len(links)} links in {elapsed:.2f}s."
+        ))
+
+    def next_link_number(self, prefix):
+        stem = f"{prefix} link ".upper()
+        names = LinkRegistry.objects.filter(link_name__startswith=stem).values_list("link_name", flat=True)
+        numbers = [int(name[len(stem):]) for name in names if name[len(stem):].isdigit()]
+        return max(numbers, default=-1) + 1
+
+    def profile(self, user, rng):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        profile = UserProfile(
+            user=user,
+            name=f"{first} {last}",
+            dob=date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55)),
+            email=f"{user.username}@example.com",
+            phone=f"+91{rng.randrange(6000000000, 9999999999)}",
+            address=f"{rng.randrange(1, 500)} Main Road, {rng.choice(CITIES)}",
+            pincode=str(rng.randrange(110001, 855999)),
+            latitude=round(rng.uniform(*LAT_RANGE), 6),
+            longitude=round(rng.uniform(*LNG_RANGE), 6),
+        )
+        profile.normalize()
+        return profile
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from ...notifications import TelegramOutboxWorker
+
+class Command(BaseCommand):
+    help = "Sends queued Telegram messages from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when nothing is due")
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        worker = TelegramOutboxWorker(poll_interval=options["poll_interval"])
+        self.stdout.write("Telegram outbox worker started.")
+        try:
+            worker.run(once=options["once"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Telegram outbox worker stopped."))
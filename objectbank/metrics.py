@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+# =============== Request Metrics ===============
+# Every thread accumulates into its own dict, so recording a request takes
+# no lock; a scrape sums the per-thread dicts. Stats are per process.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_SAMPLES = 50
+SAMPLE_QUERIES = 50
+
+current_request = ContextVar('objectbank_current_request', default=None)
+_local = threading.local()
+_thread_stats = []
+slow_samples = deque(maxlen=SLOW_SAMPLES)
+
+
+class RequestStats:
+    """What one request did; filled in by the DB execute wrapper."""
+    __slots__ = ('queries', 'db_time', 'sql')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.sql = []
+
+
+class ViewStats:
+    __slots__ = ('count', 'buckets', 'latency', 'queries', 'db_time', 'bytes', 'statuses')
+
+    def __init__(self):
+        self.count = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.bytes = 0
+        self.statuses = {}
+
+
+def thread_stats():
+    stats = getattr(_local, 'stats', None)
+    if stats is None:
+        stats = _local.stats = {}
+        _thread_stats.append(stats)
+    return stats
+
+
+def record(view, status, latency, request_stats, size):
+    stats = thread_stats().get(view)
+    if stats is None:
+        stats = thread_stats()[view] = ViewStats()
+    stats.count += 1
+    stats.latency += latency
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if latency <= bound:
+            stats.buckets[index] += 1
+            break
+    stats.queries += request_stats.queries
+    stats.db_time += request_stats.db_time
+    stats.bytes += size
+    status_class = f'{status // 100}xx'
+    stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """Installed on every DB connection; counts only inside a measured request."""
+    request_stats = current_request.get()
+    if request_stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        request_stats.queries += 1
+        request_stats.db_time += duration
+        if len(request_stats.sql) < SAMPLE_QUERIES:
+            request_stats.sql.append((sql, round(duration * 1000, 3)))
+
+# =============== Prometheus Export ===============
+def snapshot():
+    totals = {}
+    for stats in list(_thread_stats):
+        for view, view_stats in list(stats.items()):
+            total = totals.setdefault(view, ViewStats())
+            total.count += view_stats.count
+            total.latency += view_stats.latency
+            total.buckets = [a + b for a, b in zip(total.buckets, view_stats.buckets)]
+            total.queries += view_stats.queries
+            total.db_time += view_stats.db_time
+            total.bytes += view_stats.bytes
+            for status, count in list(view_stats.statuses.items()):
+                total.statuses[status] = total.statuses.get(status, 0) + count
+    return totals
+
+
+def label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    totals = sorted(snapshot().items())
+    lines = [
+        '# HELP objectbank_request_duration_seconds Request latency by view.',
+        '# TYPE objectbank_request_duration_seconds histogram',
+    ]
+    for view, stats in totals:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+            cumulative += count
+            lines.append(f'objectbank_request_duration_seconds_bucket{{view="{label(view)}",le="{bound}"}} {cumulative}')
+        lines.append(f'objectbank_request_duration_seconds_bucket{{view="{label(view)}",le="+Inf"}} {stats.count}')
+        lines.append(f'objectbank_request_duration_seconds_sum{{view="{label(view)}"}} {stats.latency:.6f}')
+        lines.append(f'objectbank_request_duration_seconds_count{{view="{label(view)}"}} {stats.count}')
+
+    counters = (
+        ('objectbank_requests_total', 'Requests by view and status class.', None),
+        ('objectbank_db_queries_total', 'DB queries run by view.', 'queries'),
+        ('objectbank_db_duration_seconds_total', 'Time spent in DB queries by view.', 'db_time'),
+        ('objectbank_response_bytes_total', 'Response body bytes by view.', 'bytes'),
+    )
+    for name, help_text, attribute in counters:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for view, stats in totals:
+            if attribute is None:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'{name}{{view="{label(view)}",status="{status}"}} {count}')
+            else:
+                value = getattr(stats, attribute)
+                value = f'{value:.6f}' if isinstance(value, float) else value
+                lines.append(f'{name}{{view="{label(view)}"}} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,102 @@
+import cProfile
+import io
+import pstats
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils import timezone
+from . import metrics
+
+PROFILE_HEADER = 'HTTP_X_METRICS_PROFILE'
+
+# =============== Metrics ===============
+class MetricsMiddleware:
+    """
+    Records latency, DB queries/time and response size per URL name, and
+    keeps samples (with SQL) of slow requests. Sending the X-Metrics-Profile
+    header (DEBUG, or equal to METRICS_TOKEN) also runs cProfile for that
+    request and returns a Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        request_stats, profiler, token = self.start(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+            if profiler:
+                profiler.disable()
+        return self.finish(request, response, request_stats, profiler, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        request_stats, profiler, token = self.start(request)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+            if profiler:
+                profiler.disable()
+        return self.finish(request, response, request_stats, profiler, time.perf_counter() - start)
+
+    def profiling_requested(self, request):
+        value = request.META.get(PROFILE_HEADER)
+        if not value:
+            return False
+        return settings.DEBUG or (settings.METRICS_TOKEN and value == settings.METRICS_TOKEN)
+
+    def start(self, request):
+        request_stats = metrics.RequestStats()
+        token = metrics.current_request.set(request_stats)
+        profiler = None
+        if self.profiling_requested(request):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return request_stats, profiler, token
+
+    def finish(self, request, response, request_stats, profiler, latency):
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        if response.streaming:
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        metrics.record(view, response.status_code, latency, request_stats, size)
+
+        if profiler or latency * 1000 >= settings.METRICS_SLOW_MS:
+            sample = {
+                'view': view,
+                'path': request.get_full_path(),
+                'method': request.method,
+                'status': response.status_code,
+                'at': timezone.now().isoformat(),
+                'latency_ms': round(latency * 1000, 3),
+                'queries': request_stats.queries,
+                'db_ms': round(request_stats.db_time * 1000, 3),
+                'sql': request_stats.sql,
+            }
+            if profiler:
+                output = io.StringIO()
+                pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(25)
+                sample['profile'] = output.getvalue()
+                response['Server-Timing'] = (
+                    f'db;dur={request_stats.db_time * 1000:.3f};desc="{request_stats.queries} queries", '
+                    f'total;dur={latency * 1000:.3f}'
+                )
+            metrics.slow_samples.append(sample)
+        return response
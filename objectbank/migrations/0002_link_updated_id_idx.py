@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='linkregistry',
+            index=models.Index(fields=['-updated_at', '-id'], name='link_updated_id_idx'),
+        ),
+    ]
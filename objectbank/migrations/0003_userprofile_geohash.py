@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from objectbank.geo import geohash_encode
+
+BATCH_SIZE = 2000
+
+
+def fill_geohash(apps, schema_editor):
+    """geohash for profiles saved before the column existed."""
+    UserProfile = apps.get_model('objectbank', 'UserProfile')
+    pending = UserProfile.objects.filter(
+        geohash__isnull=True, latitude__isnull=False, longitude__isnull=False
+    ).only('id', 'latitude', 'longitude', 'geohash')
+    last_id = 0
+    while batch := list(pending.filter(id__gt=last_id).order_by('id')[:BATCH_SIZE]):
+        last_id = batch[-1].id
+        for profile in batch:
+            profile.geohash = geohash_encode(float(profile.latitude), float(profile.longitude))
+        UserProfile.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0002_link_updated_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
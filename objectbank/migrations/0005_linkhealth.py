@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0004_telegramoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkHealth',
+            fields=[
+                ('link', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='health', serialize=False, to='objectbank.linkregistry')),
+                ('ok', models.BooleanField(default=False)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('latency_ms', models.FloatField(blank=True, null=True)),
+                ('error', models.CharField(blank=True, default='', max_length=200)),
+                ('etag', models.CharField(blank=True, default='', max_length=200)),
+                ('last_modified', models.CharField(blank=True, default='', max_length=64)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('flagged', models.BooleanField(default=False)),
+                ('checked_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+        ),
+    ]
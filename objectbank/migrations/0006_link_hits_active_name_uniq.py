@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def deactivate_duplicate_names(apps, schema_editor):
+    """Older data may hold several active links per name; keep the latest one active."""
+    LinkRegistry = apps.get_model('objectbank', 'LinkRegistry')
+    duplicates = (
+        LinkRegistry.objects.filter(active=True).values('link_name')
+        .annotate(count=models.Count('id')).filter(count__gt=1).values_list('link_name', flat=True)
+    )
+    for name in list(duplicates):
+        latest = LinkRegistry.objects.filter(active=True, link_name=name).order_by('-updated_at', '-id')[0]
+        LinkRegistry.objects.filter(active=True, link_name=name).exclude(pk=latest.pk).update(active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0005_linkhealth'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkregistry',
+            name='hits',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(deactivate_duplicate_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='linkregistry',
+            constraint=models.UniqueConstraint(condition=models.Q(('active', True)), fields=('link_name',), name='link_active_name_uniq'),
+        ),
+    ]
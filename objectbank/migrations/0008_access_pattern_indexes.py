@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0007_changelog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='linkregistry',
+            index=models.Index(fields=['user', '-updated_at', '-id'], name='link_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkregistry',
+            index=models.Index(condition=models.Q(('active', True)), fields=['-updated_at', '-id'], name='link_active_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkregistry',
+            index=models.Index(fields=['link_name', 'id'], name='link_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='linkregistry',
+            index=models.Index(fields=['created_at', 'id'], name='link_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('email__isnull', False)), fields=['email'], name='profile_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('phone__isnull', False)), fields=['phone'], name='profile_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('pincode__isnull', False)), fields=['pincode'], name='profile_pincode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['updated_at'], name='profile_updated_idx'),
+        ),
+    ]
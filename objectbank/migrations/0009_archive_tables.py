@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:01
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0008_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedLink',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('user_id', models.IntegerField(db_index=True)),
+                ('username', models.CharField(max_length=150)),
+                ('link_name', models.CharField(max_length=100)),
+                ('link_url', models.URLField(max_length=300)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('hits', models.PositiveBigIntegerField(default=0)),
+                ('reason', models.CharField(choices=[('inactive', 'Inactive'), ('user_deleted', 'User deleted')], max_length=12)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-archived_at', '-id'], name='archivedlink_archived_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedUser',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('date_joined', models.DateTimeField()),
+                ('last_login', models.DateTimeField(blank=True, null=True)),
+                ('profile', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('purged_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-deleted_at', '-id'], name='archiveduser_deleted_idx')],
+            },
+        ),
+    ]
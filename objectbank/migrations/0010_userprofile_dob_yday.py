@@ -0,0 +1,36 @@
+from django.db import migrations, models
+from objectbank.utils import leap_yday
+
+BATCH_SIZE = 2000
+
+
+def fill_dob_yday(apps, schema_editor):
+    """dob_yday for profiles saved before the column existed."""
+    UserProfile = apps.get_model('objectbank', 'UserProfile')
+    pending = UserProfile.objects.filter(dob_yday__isnull=True, dob__isnull=False).only('id', 'dob', 'dob_yday')
+    last_id = 0
+    while batch := list(pending.filter(id__gt=last_id).order_by('id')[:BATCH_SIZE]):
+        last_id = batch[-1].id
+        for profile in batch:
+            profile.dob_yday = leap_yday(profile.dob.month, profile.dob.day)
+        UserProfile.objects.bulk_update(batch, ['dob_yday'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0009_archive_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='dob_yday',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_dob_yday, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('dob_yday__isnull', False)), fields=['dob_yday'], name='profile_dob_yday_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0010_userprofile_dob_yday'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archiveduser',
+            name='link_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0011_archiveduser_link_ids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='linkregistry',
+            index=models.Index(fields=['active', 'id'], name='link_active_id_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('objectbank', '0012_link_active_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BirthdayDigest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('chat_id', models.BigIntegerField()),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+                ('message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='objectbank.telegramoutbox')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'chat_id'), name='birthday_digest_day_chat_uniq')],
+            },
+        ),
+    ]
@@ -1,8 +1,13 @@
+from decimal import Decimal
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from .utils import (
-    phone_validator, pincode_validator
+    leap_yday, phone_validator, pincode_validator
 )
+from .geo import geohash_encode
+from .geocoder import geocode
 
 # =============== UserProfile ===============
 class UserProfile(models.Model):
@@ -11,6 +16,9 @@ class UserProfile(models.Model):
     # Personal Info
     name = models.CharField(max_length=100, blank=True, null=True)
     dob = models.DateField(blank=True, null=True)    
+    # dob's day of the year, counted in a leap year (Feb 29 = 60), so
+    # "birthdays between two dates" is a range query on one index.
+    dob_yday = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True, validators=[phone_validator])
     address = models.TextField(max_length=400, blank=True, null=True)
@@ -19,20 +27,56 @@ class UserProfile(models.Model):
     # Geolocation
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True, editable=False)
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def save(self, *args, **kwargs):
+    class Meta:
+        indexes = [
+            # Exact lookups; the columns are mostly NULL, so only filled rows are indexed.
+            models.Index(fields=['email'], condition=models.Q(email__isnull=False), name='profile_email_idx'),
+            models.Index(fields=['phone'], condition=models.Q(phone__isnull=False), name='profile_phone_idx'),
+            models.Index(fields=['pincode'], condition=models.Q(pincode__isnull=False), name='profile_pincode_idx'),
+            models.Index(fields=['dob_yday'], condition=models.Q(dob_yday__isnull=False), name='profile_dob_yday_idx'),
+            # Max(updated_at) seeds the model version on a cold cache.
+            models.Index(fields=['updated_at'], name='profile_updated_idx'),
+        ]
+
+    def normalize(self):
         if self.name:
             self.name = self.name.strip().upper()
         if self.address:
             self.address = self.address.strip().upper()
         if self.email:
             self.email = self.email.strip().lower()
+        self.fill_coordinates()
+        self.update_geohash()
+        self.update_dob_yday()
+
+    def save(self, *args, **kwargs):
+        self.normalize()
         super().save(*args, **kwargs)
 
+    def fill_coordinates(self):
+        """Use the pincode's centroid when no coordinates were given; True if filled."""
+        if self.latitude is None and self.longitude is None and self.pincode:
+            centroid = geocode(self.pincode)
+            if centroid is not None:
+                self.latitude, self.longitude = (Decimal(str(value)) for value in centroid)
+                return True
+        return False
+
+    def update_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            self.geohash = None
+        else:
+            self.geohash = geohash_encode(float(self.latitude), float(self.longitude))
+
+    def update_dob_yday(self):
+        self.dob_yday = None if self.dob is None else leap_yday(self.dob.month, self.dob.day)
+
     def __str__(self):
         return self.name or self.user.username
     
@@ -44,13 +88,168 @@ class LinkRegistry(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     active = models.BooleanField(default=True)
+    hits = models.PositiveBigIntegerField(default=0, editable=False)
 
-    def save(self, *args, **kwargs):
+    class Meta:
+        indexes = [
+            models.Index(fields=['-updated_at', '-id'], name='link_updated_id_idx'),
+            # The grid's user and active filters, in its default order.
+            models.Index(fields=['user', '-updated_at', '-id'], name='link_user_updated_idx'),
+            models.Index(
+                fields=['-updated_at', '-id'], condition=models.Q(active=True), name='link_active_updated_idx'
+            ),
+            # Other grid sort keys; keyset pages break ties on id. The user_id
+            # FK index already ends in the rowid, so it serves ?ordering=user.
+            models.Index(fields=['link_name', 'id'], name='link_name_id_idx'),
+            models.Index(fields=['created_at', 'id'], name='link_created_id_idx'),
+            models.Index(fields=['active', 'id'], name='link_active_id_idx'),
+        ]
+        constraints = [
+            # link_name is stored normalized (upper case), so this is case-insensitive.
+            models.UniqueConstraint(
+                fields=['link_name'], condition=models.Q(active=True), name='link_active_name_uniq'
+            ),
+        ]
+
+    def normalize(self):
         if self.link_name:
             self.link_name = self.link_name.strip().upper()
         if self.link_url:
             self.link_url = self.link_url.strip()
+
+    def save(self, *args, **kwargs):
+        self.normalize()
         super().save(*args, **kwargs)
     
     def __str__(self):
-        return f"{self.link_name} - {self.user.username}"
\ No newline at end of file
+        return f"{self.link_name} - {self.user.username}"
+
+class LinkHealth(models.Model):
+    """Last health check of a link; kept apart so checks don't touch updated_at."""
+    link = models.OneToOneField(LinkRegistry, on_delete=models.CASCADE, primary_key=True, related_name='health')
+    ok = models.BooleanField(default=False)
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    latency_ms = models.FloatField(blank=True, null=True)
+    error = models.CharField(max_length=200, blank=True, default='')
+    etag = models.CharField(max_length=200, blank=True, default='')
+    last_modified = models.CharField(max_length=64, blank=True, default='')
+    failures = models.PositiveIntegerField(default=0)
+    flagged = models.BooleanField(default=False)
+    checked_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.link_id} - {self.status_code or self.error}"
+
+# =============== Telegram Outbox ===============
+class TelegramOutbox(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (SENT, 'Sent'), (FAILED, 'Failed')]
+
+    chat_id = models.BigIntegerField()
+    text = models.TextField()
+    parse_mode = models.CharField(max_length=20, default='Markdown')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.chat_id} - {self.status}"
+
+class BirthdayDigest(models.Model):
+    """The birthday digest queued to a group on a given day."""
+    day = models.DateField()
+    chat_id = models.BigIntegerField()
+    message = models.ForeignKey(TelegramOutbox, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    queued_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'chat_id'], name='birthday_digest_day_chat_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.chat_id}"
+
+# =============== Change Log ===============
+class ChangeLog(models.Model):
+    """Append-only feed of link/profile changes; `seq` never repeats (AUTOINCREMENT)."""
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ACTION_CHOICES = [(CREATE, 'Create'), (UPDATE, 'Update'), (DELETE, 'Delete')]
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=10)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    data = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'object_id', '-seq'], name='changelog_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.seq} {self.action} {self.kind}:{self.object_id}"
+
+# =============== Archive ===============
+class ArchivedLink(models.Model):
+    """A LinkRegistry row moved out of the hot table; `id` is its original id."""
+    INACTIVE = 'inactive'
+    USER_DELETED = 'user_deleted'
+    REASON_CHOICES = [(INACTIVE, 'Inactive'), (USER_DELETED, 'User deleted')]
+
+    id = models.IntegerField(primary_key=True)
+    # A plain column: the user may be archived and purged as well.
+    user_id = models.IntegerField(db_index=True)
+    username = models.CharField(max_length=150)
+    link_name = models.CharField(max_length=100)
+    link_url = models.URLField(max_length=300)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    hits = models.PositiveBigIntegerField(default=0)
+    reason = models.CharField(max_length=12, choices=REASON_CHOICES)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-archived_at', '-id'], name='archivedlink_archived_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.link_name} - {self.username} (archived)"
+
+class ArchivedUser(models.Model):
+    """
+    A deleted user's account and profile. The User row stays, inactive,
+    until an archive pass has moved its links; then it is purged.
+    """
+    id = models.IntegerField(primary_key=True)
+    username = models.CharField(max_length=150)
+    email = models.EmailField(blank=True)
+    date_joined = models.DateTimeField()
+    last_login = models.DateTimeField(blank=True, null=True)
+    profile = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    # Links retire_user switched off; switched back on if the user is reactivated.
+    link_ids = models.JSONField(default=list, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+    purged_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-deleted_at', '-id'], name='archiveduser_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.username} (archived)"
@@ -0,0 +1,143 @@
+import random
+import time
+from datetime import timedelta
+from itertools import groupby
+import requests
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .models import TelegramOutbox
+from .utils import TokenBucket, post_telegram
+
+# =============== Telegram Outbox ===============
+TELEGRAM_MAX_LENGTH = 4096
+MESSAGE_SEPARATOR = '\n\n'
+
+def split_message(text, limit=TELEGRAM_MAX_LENGTH):
+    """Cut `text` into parts Telegram accepts, at line breaks where possible."""
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit + 1)
+        if cut > 0:
+            yield text[:cut]
+            text = text[cut + 1:]
+        else:
+            yield text[:limit]
+            text = text[limit:]
+    yield text
+
+def queue_telegram_message(chatID: int, message, parse_mode='Markdown'):
+    """
+    Durably queue `message` for TELEGRAM_GROUPS[chatID]; the worker sends it.
+    Longer messages than Telegram takes are queued in parts. Returns the rows.
+    """
+    chat_id = settings.TELEGRAM_GROUPS[chatID]
+    return TelegramOutbox.objects.bulk_create([
+        TelegramOutbox(chat_id=chat_id, text=part, parse_mode=parse_mode) for part in split_message(message)
+    ])
+
+def coalesce(rows):
+    """Split one chat's rows into runs that fit in a single Telegram message."""
+    chunk, length = [], 0
+    for row in rows:
+        extra = len(row.text) + (len(MESSAGE_SEPARATOR) if chunk else 0)
+        if chunk and (length + extra > TELEGRAM_MAX_LENGTH or row.parse_mode != chunk[0].parse_mode):
+            yield chunk
+            chunk, length = [], 0
+            extra = len(row.text)
+        chunk.append(row)
+        length += extra
+    if chunk:
+        yield chunk
+
+
+class TelegramOutboxWorker:
+    """
+    Drains TelegramOutbox through one pooled session.
+
+    Delivery is at-least-once: a row is marked sent only after Telegram
+    accepts it. Run a single worker per outbox table.
+    """
+    batch_size = 200
+    max_attempts = 8
+    base_backoff = 2.0
+    max_backoff = 3600.0
+    chat_burst = 3
+
+    def __init__(self, poll_interval=1.0, sleep=time.sleep, clock=time.monotonic):
+        self.poll_interval = poll_interval
+        self.sleep = sleep
+        self.clock = clock
+        self.global_bucket = TokenBucket(settings.TELEGRAM_RATE_PER_SECOND, clock=clock)
+        self.chat_buckets = {}
+
+    def due(self):
+        return TelegramOutbox.objects.filter(
+            status=TelegramOutbox.PENDING, next_attempt_at__lte=timezone.now()
+        )
+
+    def chat_bucket(self, chat_id):
+        if chat_id not in self.chat_buckets:
+            self.chat_buckets[chat_id] = TokenBucket(
+                settings.TELEGRAM_CHAT_RATE_PER_MINUTE / 60, self.chat_burst, clock=self.clock
+            )
+        return self.chat_buckets[chat_id]
+
+    def run(self, once=False):
+        while True:
+            attempted = self.process_batch()
+            if attempted:
+                continue
+            if once and not self.due().exists():
+                return
+            self.sleep(self.poll_interval)
+
+    def process_batch(self):
+        rows = sorted(self.due().order_by('id')[:self.batch_size], key=lambda row: (row.chat_id, row.id))
+        attempted = 0
+        for chat_id, chat_rows in groupby(rows, key=lambda row: row.chat_id):
+            for chunk in coalesce(chat_rows):
+                # A chat over its budget waits for the next pass; other chats go on.
+                if self.chat_bucket(chat_id).consume():
+                    break
+                while wait := self.global_bucket.consume():
+                    self.sleep(wait)
+                self.deliver(chat_id, chunk)
+                attempted += 1
+        return attempted
+
+    def deliver(self, chat_id, rows):
+        ids = [row.id for row in rows]
+        text = MESSAGE_SEPARATOR.join(row.text for row in rows)
+        retry_after = None
+        try:
+            response = post_telegram(chat_id, text, rows[0].parse_mode)
+            payload = response.json()
+            if response.ok and payload.get('ok'):
+                TelegramOutbox.objects.filter(id__in=ids).update(
+                    status=TelegramOutbox.SENT, sent_at=timezone.now(),
+                    attempts=F('attempts') + 1, last_error='',
+                )
+                return True
+            error = payload.get('description') or f'HTTP {response.status_code}'
+            retry_after = (payload.get('parameters') or {}).get('retry_after')
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                # Bad chat id, bot blocked, malformed text: retrying won't help.
+                TelegramOutbox.objects.filter(id__in=ids).update(
+                    status=TelegramOutbox.FAILED, attempts=F('attempts') + 1, last_error=error,
+                )
+                return False
+        except (requests.RequestException, ValueError) as exc:
+            error = str(exc) or exc.__class__.__name__
+
+        attempts = max(row.attempts for row in rows) + 1
+        if retry_after is None:
+            delay = min(self.base_backoff * 2 ** (attempts - 1), self.max_backoff)
+            retry_after = delay * random.uniform(0.5, 1.0)
+        TelegramOutbox.objects.filter(id__in=ids).update(
+            attempts=F('attempts') + 1, last_error=error,
+            next_attempt_at=timezone.now() + timedelta(seconds=retry_after),
+        )
+        TelegramOutbox.objects.filter(id__in=ids, attempts__gte=self.max_attempts).update(
+            status=TelegramOutbox.FAILED
+        )
+        return False
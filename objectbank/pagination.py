@@ -0,0 +1,177 @@
+import json
+from base64 import b64decode, b64encode
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# =============== Keyset Pagination ===============
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (<ordering field>, pk).
+
+    The cursor carries the last row's sort value and primary key, so every
+    page is an index range scan instead of an OFFSET walk. The view supplies
+    `ordering_fields` (allowed sort keys) and `ordering` (the default).
+    """
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, view):
+        default = getattr(view, 'ordering', '-pk')
+        allowed = getattr(view, 'ordering_fields', ())
+        ordering = request.query_params.get(self.ordering_query_param, default)
+        if ordering.lstrip('-') not in allowed:
+            return default
+        return ordering
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(b64decode(encoded.encode('ascii')))
+            if value is None or pk is None:
+                # Ordering fields are NOT NULL; a null bound cannot be compared.
+                raise ValueError('null cursor value')
+            return self.clean_cursor_value(self.field, value), self.clean_cursor_value(self.pk_field, pk)
+        except (TypeError, ValueError, OverflowError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def clean_cursor_value(self, field, value):
+        # Range validators reject integers the database cannot store.
+        field = field.target_field if field.is_relation else field
+        value = field.to_python(value)
+        field.run_validators(value)
+        return value
+
+    def encode_cursor(self, value, pk):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        return b64encode(json.dumps([value, pk]).encode('utf-8')).decode('ascii')
+
+    def page_queryset(self, queryset, request, view=None):
+        """The queryset for one page plus a look-ahead row."""
+        self.request = request
+        ordering = self.get_ordering(request, view)
+        descending = ordering.startswith('-')
+        self.field = queryset.model._meta.get_field(ordering.lstrip('-'))
+        self.attname = self.field.attname
+        self.pk_field = queryset.model._meta.pk
+        # .values() rows are dicts keyed by field name rather than attname.
+        self.row_keys = (self.field.name, queryset.model._meta.pk.name)
+
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(prefix + self.attname, prefix + 'pk')
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            value, pk = cursor
+            op, bound = ('lt', 'lte') if descending else ('gt', 'gte')
+            # The redundant bound keeps SQLite on an index range scan.
+            queryset = queryset.filter(**{f'{self.attname}__{bound}': value}).filter(
+                Q(**{f'{self.attname}__{op}': value}) | Q(**{f'pk__{op}': pk})
+            )
+
+        self.size = self.get_page_size(request)
+        return queryset[:self.size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.size
+        self.page = rows[:self.size]
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return self.set_page([row async for row in queryset.aiterator()])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        if isinstance(last, dict):
+            cursor = self.encode_cursor(last[self.row_keys[0]], last[self.row_keys[1]])
+        else:
+            cursor = self.encode_cursor(getattr(last, self.attname), last.pk)
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+# =============== Estimated Counts ===============
+ESTIMATED_COUNT_KEY = 'estimated-count:{}'
+ESTIMATED_COUNT_TIMEOUT = 5 * 60
+MAX_EXACT_COUNT = 10_000
+
+
+def table_rows(model):
+    """Row count of `model`'s table; PostgreSQL's planner estimate when it has one."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return int(row[0])
+    return model._default_manager.count()
+
+
+def estimated_count(model):
+    """table_rows(), recomputed at most every ESTIMATED_COUNT_TIMEOUT seconds."""
+    key = ESTIMATED_COUNT_KEY.format(model._meta.label_lower)
+    count = cache.get(key)
+    if count is None:
+        count = table_rows(model)
+        cache.set(key, count, ESTIMATED_COUNT_TIMEOUT)
+    return count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Page-number pagination without a COUNT(*) per page, for admin changelists.
+
+    An unfiltered list uses the table's estimated size; a filtered one is
+    counted only up to MAX_EXACT_COUNT rows, so the count query stops early.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            return estimated_count(queryset.model)
+        return queryset.order_by()[:MAX_EXACT_COUNT].count()
@@ -0,0 +1,216 @@
+import json
+import re
+from base64 import b64decode, b64encode
+import numpy as np
+from django.contrib.auth.models import User
+from django.db import connection, OperationalError
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+from .models import UserProfile
+from .geo import bounding_box, covering_cells, haversine_km
+
+# =============== Profile Search (SQLite FTS5) ===============
+FTS_TABLE = 'objectbank_userprofile_fts'
+FTS_COLUMNS = ('name', 'email', 'phone', 'pincode')
+_fts_ready = None
+
+
+def fts_enabled():
+    global _fts_ready
+    if _fts_ready is None:
+        _fts_ready = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_ready
+
+
+def ensure_index():
+    """Create the FTS5 table if missing and fill it from UserProfile."""
+    global _fts_ready
+    if connection.vendor != 'sqlite':
+        return False
+    tables = connection.introspection.table_names()
+    if FTS_TABLE in tables:
+        _fts_ready = True
+        return True
+    if UserProfile._meta.db_table not in tables:
+        # post_migrate also fires for runs that leave objectbank unmigrated (e.g. `migrate auth`).
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                f"USING fts5({', '.join(FTS_COLUMNS)}, tokenize='unicode61')"
+            )
+    except OperationalError:
+        # SQLite built without FTS5: search falls back to LIKE queries.
+        return False
+    _fts_ready = True
+    rebuild_index()
+    return True
+
+
+def rebuild_index():
+    profile_table = UserProfile._meta.db_table
+    columns = ', '.join(FTS_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+            f"SELECT id, {columns} FROM {profile_table}"
+        )
+
+
+def index_profiles(profiles):
+    if not fts_enabled():
+        return
+    columns = ', '.join(FTS_COLUMNS)
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    rows = [
+        (profile.pk, *(getattr(profile, column) for column in FTS_COLUMNS))
+        for profile in profiles
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, {columns}) VALUES ({placeholders})",
+            rows,
+        )
+
+
+def unindex_profiles(pks):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in pks])
+
+
+def match_expression(query):
+    # Every term becomes a quoted prefix query, so user input never reaches
+    # the FTS5 query syntax.
+    return ' '.join(f'"{term}"*' for term in re.findall(r'[^\W_]+', query))
+
+
+def search_profiles(queryset, query, after=0, limit=50):
+    """
+    Narrow `queryset` to profiles matching `query` with id > `after`,
+    ordered by id and capped at `limit` rows (None for no cap).
+    """
+    queryset = queryset.filter(id__gt=after).order_by('id')
+    if not query:
+        return queryset[:limit]
+    if fts_enabled():
+        expression = match_expression(query)
+        if not expression:
+            return queryset[:limit]
+        # A subquery rather than a list of ids, so `queryset`'s own filters
+        # apply before the LIMIT and pages come back full.
+        matches = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid > %s", [expression, after]
+        )
+        return queryset.filter(id__in=matches)[:limit]
+    lookup = Q()
+    for column in FTS_COLUMNS:
+        lookup |= Q(**{f'{column}__icontains': query})
+    return queryset.filter(lookup)[:limit]
+
+
+# =============== User Autocomplete ===============
+# auth_user is Django's table, so the expression index is created from
+# post_migrate like the FTS table rather than declared on a model.
+USERNAME_INDEX = 'objectbank_user_lower_username_idx'
+ACTIVE_USERS_INDEX = 'objectbank_user_active_idx'
+USER_INDEXES = (
+    f"CREATE INDEX IF NOT EXISTS {USERNAME_INDEX} ON {{table}} (LOWER(username), id)",
+    # Covers user_list (active users' id and username) without reading the table.
+    f"CREATE INDEX IF NOT EXISTS {ACTIVE_USERS_INDEX} ON {{table}} (id, username) WHERE is_active",
+)
+USER_SEARCH_LIMIT = 20
+USER_SEARCH_MAX_LIMIT = 100
+
+
+def ensure_user_index():
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        return False
+    table = User._meta.db_table
+    if table not in connection.introspection.table_names():
+        return False
+    with connection.cursor() as cursor:
+        for statement in USER_INDEXES:
+            cursor.execute(statement.format(table=table))
+    return True
+
+
+def encode_user_cursor(lower, pk):
+    return b64encode(json.dumps([lower, pk]).encode('utf-8')).decode('ascii')
+
+
+def decode_user_cursor(cursor):
+    """(lower username, id) from a cursor, or ValueError."""
+    try:
+        lower, pk = json.loads(b64decode(cursor.encode('ascii')))
+        return str(lower), int(pk)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+def search_users(prefix, cursor=None, limit=USER_SEARCH_LIMIT):
+    """
+    Active users whose username starts with `prefix` (case-insensitive),
+    ordered by lower-cased username. Returns (rows, next cursor or None).
+    """
+    queryset = User.objects.filter(is_active=True).annotate(lower=Lower('username'))
+    prefix = prefix.strip().lower()
+    if prefix:
+        # A range on LOWER(username) stays on the expression index; LIKE would not.
+        queryset = queryset.filter(lower__gte=prefix, lower__lt=prefix + '\U0010ffff')
+    if cursor:
+        lower, pk = decode_user_cursor(cursor)
+        queryset = queryset.filter(lower__gte=lower).filter(Q(lower__gt=lower) | Q(id__gt=pk))
+    rows = list(queryset.order_by('lower', 'id').values('id', 'username', 'lower')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_user_cursor(rows[-1]['lower'], rows[-1]['id'])
+    return [{'id': row['id'], 'username': row['username']} for row in rows], next_cursor
+
+
+# =============== Nearby Profiles ===============
+NEARBY_FIELDS = ('user_id', 'name')
+
+
+def nearby_profiles(lat, lng, radius_km, k, fields=NEARBY_FIELDS):
+    """
+    The `k` profiles closest to (lat, lng) within `radius_km`, nearest first.
+
+    SQL narrows the candidates to the geohash cells and bounding box around
+    the point; exact haversine distances are then computed in one numpy pass.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    cells = Q()
+    for prefix in covering_cells(min_lat, max_lat, min_lng, max_lng):
+        # Range lookups keep SQLite on the geohash index, unlike LIKE.
+        cells |= Q(geohash__gte=prefix, geohash__lt=prefix + '~')
+    queryset = UserProfile.objects.filter(
+        cells, latitude__gte=min_lat, latitude__lte=max_lat, user__is_active=True
+    )
+    if min_lng >= -180 and max_lng <= 180:
+        queryset = queryset.filter(longitude__gte=min_lng, longitude__lte=max_lng)
+
+    rows = list(queryset.values_list('latitude', 'longitude', *fields))
+    if not rows:
+        return []
+    coords = np.array([row[:2] for row in rows], dtype=float)
+    distances = haversine_km(lat, lng, coords[:, 0], coords[:, 1])
+    within = np.flatnonzero(distances <= radius_km)
+    nearest = within[np.argsort(distances[within], kind='stable')[:k]]
+    return [
+        {
+            **dict(zip(fields, rows[index][2:])),
+            'latitude': rows[index][0],
+            'longitude': rows[index][1],
+            'distance_km': round(float(distances[index]), 3),
+        }
+        for index in nearest
+    ]
@@ -1,12 +1,56 @@
-from .models import LinkRegistry
+from .models import ArchivedLink, ArchivedUser, LinkRegistry
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import F
+from django.utils import timezone
 
 class LinkRegistrySerializer(serializers.ModelSerializer):
-    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    # An autocomplete input instead of a <select> holding every user.
+    user = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), style={'template': 'rest_framework/user_autocomplete.html'}
+    )
     username = serializers.CharField(source='user.username', read_only=True)
 
     class Meta:
         model = LinkRegistry
         fields = "__all__"
         read_only_fields = ("created_at", "updated_at")
+
+    def validate_link_name(self, value):
+        # Normalize before the unique-active-name check, as save() would.
+        return value.strip().upper()
+
+class ArchivedLinkSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedLink
+        fields = "__all__"
+
+class ArchivedUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedUser
+        fields = "__all__"
+
+# =============== Read Fast Path ===============
+# List endpoints build rows from .values() rather than model instances and
+# per-field serialization; the rows match LinkRegistrySerializer's output.
+LINK_VALUES = ('id', 'user', 'link_name', 'link_url', 'created_at', 'updated_at', 'active', 'hits')
+
+
+def datetime_repr(value, tz):
+    """`value` as DRF's DateTimeField renders it: ISO 8601 in time zone `tz`."""
+    if value is None:
+        return None
+    value = value.astimezone(tz).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def link_values(queryset):
+    return queryset.values(*LINK_VALUES, username=F('user__username'))
+
+
+def link_rows(rows):
+    tz = timezone.get_current_timezone()
+    return [
+        {**row, 'created_at': datetime_repr(row['created_at'], tz), 'updated_at': datetime_repr(row['updated_at'], tz)}
+        for row in rows
+    ]
@@ -0,0 +1,113 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import F
+from .caching import MISSING, LocalLRU, bump_version, model_state
+from .db import run_write
+from .models import LinkRegistry
+
+logger = logging.getLogger(__name__)
+
+# =============== Short-Link Resolver ===============
+# An in-process LRU sits in front of the shared cache. Shared entries are
+# keyed by the LinkRegistry version, so any link write retires them all;
+# local entries live SHORTLINK_LOCAL_TTL seconds and are dropped in the
+# writing process on save/delete (other processes catch up within the TTL).
+SHORTLINK_KEY = 'shortlink:{}:{}'
+NOT_FOUND = ()
+
+local_links = LocalLRU(settings.SHORTLINK_LOCAL_SIZE, settings.SHORTLINK_LOCAL_TTL)
+
+
+def normalize_name(link_name):
+    return link_name.strip().upper()
+
+
+def resolve(link_name):
+    """Return (id, link_url) of the active link called `link_name`, or None."""
+    name = normalize_name(link_name)
+    target = local_links.get(name)
+    if target is MISSING:
+        version, _ = model_state(LinkRegistry)
+        key = SHORTLINK_KEY.format(version, name)
+        target = cache.get(key)
+        if target is None:
+            # At most one active row per name; slicing avoids first()'s ORDER BY id.
+            rows = LinkRegistry.objects.filter(active=True, link_name=name).values_list('id', 'link_url')[:1]
+            target = tuple(rows[0]) if rows else NOT_FOUND
+            cache.set(key, target, settings.SHORTLINK_CACHE_TIMEOUT)
+        local_links.set(name, target)
+    return target or None
+
+
+def invalidate():
+    local_links.clear()
+
+# =============== Hit Counters ===============
+class HitCounter:
+    """
+    Counts redirects in memory and adds them to LinkRegistry.hits from a
+    background thread every SHORTLINK_HIT_FLUSH_SECONDS, in one write
+    transaction (0 disables the thread; call flush() yourself), then bumps
+    the LinkRegistry version. Counts not yet flushed are lost if the
+    process is killed.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def add(self, link_id):
+        with self.lock:
+            self.counts[link_id] += 1
+        if self.thread is None and settings.SHORTLINK_HIT_FLUSH_SECONDS > 0:
+            self.start()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='shortlink-hits', daemon=True)
+                self.thread.start()
+                atexit.register(self.flush)
+
+    def run(self):
+        while True:
+            time.sleep(settings.SHORTLINK_HIT_FLUSH_SECONDS)
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Could not flush short-link hit counters")
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+        if not counts:
+            return 0
+        try:
+            run_write(self.apply, counts)
+        except Exception:
+            with self.lock:
+                self.counts.update(counts)
+            raise
+        # update() sends no signals: retire the cached link lists (they show
+        # hits) once per flush rather than once per redirect.
+        bump_version(LinkRegistry)
+        return sum(counts.values())
+
+    def apply(self, counts):
+        by_count = {}
+        for link_id, count in counts.items():
+            by_count.setdefault(count, []).append(link_id)
+        # update() leaves updated_at alone: a redirect is not an edit.
+        for count, ids in by_count.items():
+            LinkRegistry.objects.filter(pk__in=ids).update(hits=F('hits') + count)
+
+
+hit_counter = HitCounter()
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import UserProfile, LinkRegistry, ChangeLog
+from .caching import bump_version
+from .db import apply_sqlite_pragmas
+from .metrics import execute_wrapper
+from . import changes, search, shortlinks
+
+# =============== SQLite Tuning ===============
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite' and settings.SQLITE_CONCURRENCY_MODE:
+        apply_sqlite_pragmas(connection)
+
+# =============== Metrics ===============
+@receiver(connection_created)
+def install_metrics_wrapper(sender, connection, **kwargs):
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+# =============== Profile Search Index ===============
+@receiver(post_save, sender=UserProfile)
+def index_profile(sender, instance, **kwargs):
+    search.index_profiles([instance])
+
+@receiver(post_delete, sender=UserProfile)
+def unindex_profile(sender, instance, **kwargs):
+    search.unindex_profiles([instance.pk])
+
+def create_search_index(sender, **kwargs):
+    search.ensure_index()
+    search.ensure_user_index()
+
+# =============== Model Versions ===============
+# Bump after commit, so a reader that sees the new version also sees the rows.
+@receiver(post_save, sender=User)
+def bump_user_version(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no cached view exposes.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(lambda: bump_version(User))
+
+@receiver(post_delete, sender=User)
+def bump_user_version_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(User))
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def bump_profile_version(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(UserProfile))
+
+@receiver(post_save, sender=LinkRegistry)
+def bump_link_version(sender, instance, **kwargs):
+    modified = instance.updated_at
+    transaction.on_commit(lambda: bump_version(LinkRegistry, modified))
+    transaction.on_commit(shortlinks.invalidate)
+
+@receiver(post_delete, sender=LinkRegistry)
+def bump_link_version_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(LinkRegistry))
+    transaction.on_commit(shortlinks.invalidate)
+
+# =============== Change Feed ===============
+@receiver(post_save, sender=LinkRegistry)
+@receiver(post_save, sender=UserProfile)
+def record_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    changes.record(instance, ChangeLog.CREATE if created else ChangeLog.UPDATE)
+
+@receiver(post_delete, sender=LinkRegistry)
+@receiver(post_delete, sender=UserProfile)
+def record_delete(sender, instance, **kwargs):
+    changes.record(instance, ChangeLog.DELETE)
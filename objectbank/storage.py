@@ -0,0 +1,23 @@
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+from .assets import is_minifiable, minify
+
+# =============== Static Files ===============
+class StaticAssetStorage(CompressedManifestStaticFilesStorage):
+    """
+    collectstatic storage: minifies our own CSS/JS, then WhiteNoise adds
+    content hashes, a manifest and .gz/.br variants.
+    """
+
+    def _save(self, name, content):
+        if is_minifiable(name):
+            content.seek(0)
+            content = ContentFile(minify(name, content.read().decode('utf-8')).encode('utf-8'))
+        return super()._save(name, content)
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not built yet (no manifest entry): use the plain file name.
+            return name
@@ -0,0 +1,9 @@
+from django import template
+from ..assets import vendor_url
+
+register = template.Library()
+
+@register.simple_tag
+def vendor(name):
+    """URL of a vendored library, e.g. {% vendor 'bootstrap.css' %}."""
+    return vendor_url(name)
@@ -0,0 +1,173 @@
+import hashlib
+import math
+import threading
+import time
+from functools import lru_cache, wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+from .caching import MISSING, LocalLRU
+from .utils import TokenBucket
+
+# =============== Budgets ===============
+# A budget is "<count>/<second|minute|hour|day>" in settings.THROTTLE_RATES:
+# `count` requests may burst, refilling evenly over the period. Checks run
+# before a view does any work, so a rejected login never reaches PBKDF2.
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+LOCAL_BUCKETS = 100_000
+THROTTLE_KEY = 'throttle:{}:{}:{}'
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """'10/minute' -> (capacity 10, refill rate in tokens per second)."""
+    count, period = rate.split('/')
+    count = int(count)
+    return count, count / PERIODS[period.strip()[0]]
+
+
+class LocalBuckets:
+    """A TokenBucket per (scope, key) in this process, least recently used evicted."""
+
+    def __init__(self, size=LOCAL_BUCKETS, clock=time.monotonic):
+        self.clock = clock
+        # An evicted bucket is one nobody has used lately, so it was full anyway.
+        self.buckets = LocalLRU(size, math.inf, clock)
+        self.lock = threading.Lock()
+
+    def take(self, scope, key, capacity, rate):
+        with self.lock:
+            bucket = self.buckets.get((scope, key))
+            if bucket is MISSING:
+                bucket = TokenBucket(rate, capacity, clock=self.clock)
+                self.buckets.set((scope, key), bucket)
+        return bucket.consume()
+
+    def clear(self):
+        self.buckets.clear()
+
+
+class CacheBuckets:
+    """
+    The same budgets kept in the shared cache, for several processes.
+
+    The cache API only has an atomic incr, so this counts requests in fixed
+    windows of one period rather than refilling continuously.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+
+    def take(self, scope, key, capacity, rate):
+        period = capacity / rate
+        now = self.clock()
+        window = int(now // period)
+        cache_key = THROTTLE_KEY.format(scope, hashlib.md5(key.encode()).hexdigest(), window)
+        cache.add(cache_key, 0, math.ceil(period) + 1)
+        try:
+            count = cache.incr(cache_key)
+        except ValueError:
+            cache.set(cache_key, 1, math.ceil(period) + 1)
+            count = 1
+        if count <= capacity:
+            return 0.0
+        return (window + 1) * period - now
+
+
+local_buckets = LocalBuckets()
+cache_buckets = CacheBuckets()
+
+
+def take(scope, key):
+    """Spend one request of `scope`'s budget for `key`; 0, or seconds to wait."""
+    capacity, rate = parse_rate(settings.THROTTLE_RATES[scope])
+    buckets = cache_buckets if settings.THROTTLE_SHARED else local_buckets
+    return buckets.take(scope, key, capacity, rate)
+
+
+def check(request, rules):
+    """Run `rules` ((scope, key function) pairs) in order; 0, or seconds to wait."""
+    for scope, key_for in rules:
+        key = key_for(request)
+        if key is None:
+            continue
+        wait = take(scope, key)
+        if wait:
+            return wait
+    return 0.0
+
+# =============== Keys ===============
+def client_ip(request):
+    # DRF's ident honours NUM_PROXIES for X-Forwarded-For.
+    return BaseThrottle().get_ident(request)
+
+
+def posted_username(request):
+    return request.POST.get('username', '').strip().lower() or None
+
+
+def user_or_ip(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{client_ip(request)}'
+
+
+def anonymous_ip(request):
+    # Staff creating accounts through signup?admin=1 are not rate limited.
+    if request.user.is_staff:
+        return None
+    return client_ip(request)
+
+
+def everyone(request):
+    return 'all'
+
+
+LOGIN_RULES = (
+    ('login_ip', client_ip),
+    ('login_user', posted_username),
+    ('password_hash', everyone),
+)
+SIGNUP_RULES = (
+    ('signup_ip', anonymous_ip),
+    ('password_hash', everyone),
+)
+WRITE_RULES = (
+    ('write_user', user_or_ip),
+    ('write', everyone),
+)
+
+# =============== Views ===============
+def throttle(rules, methods=('POST',)):
+    """Answer 429 with Retry-After when a `methods` request is over a budget."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                wait = check(request, rules)
+                if wait:
+                    response = HttpResponse(
+                        "Too many attempts. Please try again shortly.", status=429, content_type='text/plain'
+                    )
+                    response['Retry-After'] = str(math.ceil(wait))
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class WriteThrottle(BaseThrottle):
+    """DRF throttle for unsafe methods: per user (or IP) and global write budgets."""
+    rules = WRITE_RULES
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        self.wait_seconds = check(request, self.rules)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
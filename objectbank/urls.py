@@ -1,8 +1,7 @@
 from django.urls import path
 from .views import (
     auth, views, link_registry,
-    profile
-    
+    profile, metrics
 )
 
 urlpatterns = [
@@ -22,4 +21,9 @@ urlpatterns = [
 
     # Link Registry URL
     path('link-registry/', link_registry.link_registry_view, name='link-registry'),
+    path('l/<str:link_name>', link_registry.link_redirect, name='link-redirect'),
+
+    # Metrics URLs
+    path('metrics', metrics.metrics_view, name='metrics'),
+    path('metrics/slow', metrics.slow_requests_view, name='metrics-slow'),
 ]
\ No newline at end of file
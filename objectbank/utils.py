@@ -1,6 +1,10 @@
 from django.core.validators import RegexValidator
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+import threading
 import requests
+import time
+from datetime import date
 
 # =============== Validators ===============
 phone_validator = RegexValidator(
@@ -13,12 +17,49 @@ pincode_validator = RegexValidator(
     message="Pincode must be between 4 and 10 digits."
 )
 
+# =============== Dates ===============
+# Birthdays are keyed by day of the year in a leap year, so Feb 29 has a
+# key of its own (60) and every later day keeps the same key every year.
+LEAP_YEAR = 2000
+
+def leap_yday(month, day):
+    return date(LEAP_YEAR, month, day).timetuple().tm_yday
+
+# =============== Rate Limiting ===============
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`; safe across threads."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def consume(self, tokens=1):
+        """Take `tokens` and return 0, or return the seconds until they exist."""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
 # =============== Telegram Bot ===============
-GROUPS = settings.TELEGRAM_GROUPS
-BOT = settings.TELEGRAM_BOT_TOKEN
+TELEGRAM_TIMEOUT = (3.05, 10)
+
+telegram_session = requests.Session()
+telegram_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=8))
+telegram_session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=8))
+
+def post_telegram(chat_id: int, text, parse_mode='Markdown'):
+    url = f'{settings.TELEGRAM_API_URL}/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage'
+    payload = {'chat_id': chat_id, 'text': text, 'parse_mode': parse_mode}
+    return telegram_session.post(url, json=payload, timeout=TELEGRAM_TIMEOUT)
 
 def send_telegram_message(chatID: int, message):
-    url = f'https://api.telegram.org/bot{BOT}/sendMessage'
-    params = {'chat_id': GROUPS[chatID],'text': message,'parse_mode': 'Markdown'}
-    response = requests.get(url, params=params)
-    return response.json()
\ No newline at end of file
+    response = post_telegram(settings.TELEGRAM_GROUPS[chatID], message)
+    return response.json()
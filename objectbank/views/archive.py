@@ -0,0 +1,32 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.viewsets import ReadOnlyModelViewSet
+from ..models import ArchivedLink, ArchivedUser
+from ..pagination import KeysetPagination
+from ..serializers import ArchivedLinkSerializer, ArchivedUserSerializer
+
+# =============== ARCHIVE API ===============
+# Read-only access to the cold tables; LinkRegistryViewSet never reads them.
+class ArchivedLinkViewSet(ReadOnlyModelViewSet):
+    queryset = ArchivedLink.objects.all()
+    serializer_class = ArchivedLinkSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = KeysetPagination
+    ordering = '-archived_at'
+    ordering_fields = ('archived_at', 'id')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if params.get('user', '').isdigit():
+            queryset = queryset.filter(user_id=params['user'])
+        if params.get('reason'):
+            queryset = queryset.filter(reason=params['reason'])
+        return queryset
+
+class ArchivedUserViewSet(ReadOnlyModelViewSet):
+    queryset = ArchivedUser.objects.all()
+    serializer_class = ArchivedUserSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = KeysetPagination
+    ordering = '-deleted_at'
+    ordering_fields = ('deleted_at', 'id')
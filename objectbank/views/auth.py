@@ -3,6 +3,7 @@ from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.shortcuts import render, redirect
 from django.contrib.auth.models import User
+from adrf.decorators import api_view as async_api_view
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
@@ -12,8 +13,14 @@ from ..forms import (
     AuthForm
 )
 from ..models import UserProfile
+from ..caching import anonymous_page_cache, versioned_cache
+from ..db import run_write
+from ..throttling import LOGIN_RULES, SIGNUP_RULES, throttle
+from ..search import USER_SEARCH_LIMIT, USER_SEARCH_MAX_LIMIT, search_users
 
 # =============== AUTH VIEWS ===============
+@anonymous_page_cache()
+@throttle(LOGIN_RULES)
 def login_view(request):
     if request.user.is_authenticated:
         return redirect("home")
@@ -31,6 +38,7 @@ def login_view(request):
     context["auth_form"] = auth_form
     return render(request, 'auth/login.html', context)
 
+@throttle(SIGNUP_RULES)
 def signup_view(request):
     admin = request.GET.get("admin", None)
     if request.user.is_authenticated and not admin:
@@ -47,24 +55,29 @@ def signup_view(request):
         context["signup_form"] = signup_form
         context["profile_form"] = profile_form
 
-        if signup_form.is_valid():
-            user = signup_form.save()
-        else:
+        # Validate both forms before saving: the password is only hashed
+        # once we know the user will be kept, and outside the transaction.
+        if not signup_form.is_valid():
             messages.error(request, f"{signup_form.errors}")
             return render(request, 'auth/signup.html', context)
-        if profile_form.is_valid():
+        if not profile_form.is_valid():
+            messages.error(request, f"{profile_form.errors}")
+            return render(request, 'auth/signup.html', context)
+
+        user = signup_form.save(commit=False)
+
+        def create_user():
+            user.save()
             userprofile = profile_form.save(commit=False)
             userprofile.user = user
             userprofile.save()
-            if request.user.is_authenticated:
-                messages.success(request, "User created successfully!")
-                return redirect("profiles")
-            login(request, user, backend='django.contrib.auth.backends.ModelBackend')
-            return redirect("home")
-        else:
-            user.delete()  # Rollback user creation if profile is invalid
-            messages.error(request, f"{profile_form.errors}")
-            return render(request, 'auth/signup.html', context)
+
+        run_write(create_user)
+        if request.user.is_authenticated:
+            messages.success(request, "User created successfully!")
+            return redirect("profiles")
+        login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+        return redirect("home")
 
     return render(request, 'auth/signup.html', context)
 
@@ -74,6 +87,27 @@ def logout_view(request):
 
 # =============== REST API VIEWS ===============
 @api_view(['GET'])
+@versioned_cache(User)
 def user_list(request):
     users = User.objects.filter(is_active=True).values('id', 'username')
-    return Response(list(users))
\ No newline at end of file
+    return Response(list(users))
+
+@async_api_view(['GET'])
+@versioned_cache(User)
+async def auser_list(request):
+    users = User.objects.filter(is_active=True).values('id', 'username')
+    return Response([user async for user in users.aiterator()])
+
+@api_view(['GET'])
+@versioned_cache(User)
+def user_search(request):
+    """Username autocomplete: ?q=<prefix>&cursor=<next>&limit=<n>."""
+    try:
+        limit = int(request.GET.get("limit", USER_SEARCH_LIMIT))
+        results, next_cursor = search_users(
+            request.GET.get("q", ""), request.GET.get("cursor"),
+            max(1, min(limit, USER_SEARCH_MAX_LIMIT)),
+        )
+    except ValueError:
+        return Response({"detail": "Invalid limit or cursor."}, status=400)
+    return Response({"next": next_cursor, "results": results})
@@ -0,0 +1,39 @@
+# Django imports
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+# Imports
+from ..changes import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE, changes_since
+
+# =============== CHANGE FEED API ===============
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def change_feed(request):
+    """
+    Changes after ?since=<seq>, oldest first. Poll again with `next_since`
+    while `has_more` is true; deletes arrive as entries with action
+    "delete" and no data.
+    """
+    try:
+        since = int(request.GET.get("since", 0))
+        limit = int(request.GET.get("limit", CHANGES_PAGE_SIZE))
+    except ValueError:
+        return Response({"detail": "since and limit must be integers."}, status=400)
+    limit = max(1, min(limit, CHANGES_MAX_PAGE_SIZE))
+    rows, has_more = changes_since(since, limit)
+    return Response({
+        "changes": [
+            {
+                "seq": row.seq,
+                "kind": row.kind,
+                "id": row.object_id,
+                "action": row.action,
+                "data": row.data,
+                "at": row.created_at,
+            }
+            for row in rows
+        ],
+        "next_since": rows[-1].seq if rows else since,
+        "has_more": has_more,
+    })
@@ -0,0 +1,22 @@
+# Django imports
+from django.http import Http404, HttpResponseForbidden, StreamingHttpResponse
+
+# Imports
+from ..datasets import DATASETS, buffered, csv_lines, ndjson_lines
+
+EXPORT_FORMATS = {
+    'csv': (csv_lines, 'text/csv; charset=utf-8'),
+    'ndjson': (ndjson_lines, 'application/x-ndjson'),
+}
+
+# =============== EXPORT VIEWS ===============
+def export_view(request, dataset):
+    if not request.user.is_staff:
+        return HttpResponseForbidden("Staff only.")
+    fmt = request.GET.get("format", "csv")
+    if dataset not in DATASETS or fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export.")
+    lines, content_type = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(buffered(lines(dataset)), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{dataset}.{fmt}"'
+    return response
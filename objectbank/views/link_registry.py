@@ -1,17 +1,215 @@
 # views.py
+from adrf.viewsets import GenericViewSet as AsyncGenericViewSet
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponseRedirect
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from ..models import LinkRegistry
-from ..serializers import LinkRegistrySerializer
+from ..models import ChangeLog, LinkRegistry
+from ..serializers import LinkRegistrySerializer, link_rows, link_values
 from ..permissions import IsAdminOrReadOnly
+from ..pagination import KeysetPagination
+from ..throttling import WriteThrottle
+from ..caching import bump_version, versioned_cache
+from ..changes import record_many
+from ..db import run_write
+from ..shortlinks import hit_counter, invalidate, resolve
 from django.shortcuts import render
 
+TRUE_VALUES = ('1', 'true', 'yes')
+BULK_MAX_ROWS = 1000
+INVALID_ID = {"id": ["A valid integer is required."]}
+NOT_FOUND = {"id": ["Not found."]}
+
+def parse_id(value):
+    """A bulk row's id as an int, or None if it is not one."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
 class LinkRegistryViewSet(ModelViewSet):
-    queryset = LinkRegistry.objects.all()
+    queryset = LinkRegistry.objects.select_related('user')
     serializer_class = LinkRegistrySerializer
     permission_classes = [IsAdminOrReadOnly]
+    throttle_classes = [WriteThrottle]
+    pagination_class = KeysetPagination
+    ordering = '-updated_at'
+    # Each has an index ending in id (see LinkRegistry.Meta); link_url is
+    # too wide to index just for sorting.
+    ordering_fields = (
+        'link_name', 'user', 'active', 'created_at', 'updated_at', 'id'
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if params.get('link_name'):
+            queryset = queryset.filter(link_name__icontains=params['link_name'])
+        if params.get('link_url'):
+            queryset = queryset.filter(link_url__icontains=params['link_url'])
+        if params.get('user', '').isdigit():
+            queryset = queryset.filter(user_id=params['user'])
+        if params.get('active'):
+            queryset = queryset.filter(active=params['active'].lower() in TRUE_VALUES)
+        return queryset
+
+    # Rows carry the owner's username, so renaming a user changes the list too.
+    @method_decorator(versioned_cache(LinkRegistry, User))
+    def list(self, request, *args, **kwargs):
+        # Read-only fast path; writes still go through LinkRegistrySerializer.
+        queryset = link_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginator.paginate_queryset(queryset, request, view=self)
+        return self.paginator.get_paginated_response(link_rows(page))
 
     def perform_create(self, serializer):
-        serializer.save()
+        run_write(serializer.save)
+
+    def perform_update(self, serializer):
+        run_write(serializer.save)
+
+    def perform_destroy(self, instance):
+        run_write(instance.delete)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Apply {"create": [...], "update": [...], "delete": [...]} in one
+        transaction. Nothing is written unless every row validates; errors
+        are reported per row, keyed by operation and row index.
+        """
+        data = request.data
+        if not isinstance(data, dict):
+            return Response(
+                {"detail": "Expected an object with create, update and delete lists."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        creates = data.get('create', [])
+        updates = data.get('update', [])
+        deletes = data.get('delete', [])
+        if not all(isinstance(rows, list) for rows in (creates, updates, deletes)):
+            return Response(
+                {"detail": "create, update and delete must be lists."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(creates) + len(updates) + len(deletes) > BULK_MAX_ROWS:
+            return Response(
+                {"detail": f"At most {BULK_MAX_ROWS} rows per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        errors = {"create": {}, "update": {}, "delete": {}}
+        # Ids are checked before any lookup: a list or object is a row error, not a 500.
+        update_ids = [parse_id(row.get('id')) if isinstance(row, dict) else None for row in updates]
+        delete_ids = [parse_id(pk) for pk in deletes]
+        existing = LinkRegistry.objects.select_related('user').in_bulk(
+            [pk for pk in update_ids + delete_ids if pk is not None]
+        )
+
+        new_links = []
+        for index, row in enumerate(creates):
+            serializer = self.get_serializer(data=row)
+            if serializer.is_valid():
+                new_links.append(LinkRegistry(**serializer.validated_data))
+            else:
+                errors["create"][index] = serializer.errors
+
+        changed_links, changed_fields = [], {'updated_at'}
+        for index, (row, pk) in enumerate(zip(updates, update_ids)):
+            if pk is None:
+                errors["update"][index] = INVALID_ID
+                continue
+            link = existing.get(pk)
+            if link is None:
+                errors["update"][index] = NOT_FOUND
+                continue
+            serializer = self.get_serializer(link, data=row, partial=True)
+            if serializer.is_valid():
+                for field, value in serializer.validated_data.items():
+                    setattr(link, field, value)
+                changed_fields.update(serializer.validated_data)
+                changed_links.append(link)
+            else:
+                errors["update"][index] = serializer.errors
+
+        for index, pk in enumerate(delete_ids):
+            if pk is None:
+                errors["delete"][index] = INVALID_ID
+            elif pk not in existing:
+                errors["delete"][index] = NOT_FOUND
+
+        if any(errors.values()):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        for link in new_links + changed_links:
+            link.normalize()
+        for link in changed_links:
+            link.updated_at = now
+
+        def apply():
+            created = LinkRegistry.objects.bulk_create(new_links)
+            if changed_links:
+                LinkRegistry.objects.bulk_update(changed_links, sorted(changed_fields))
+            if delete_ids:
+                LinkRegistry.objects.filter(pk__in=delete_ids).delete()
+            # bulk_create/bulk_update send no signals.
+            record_many(created, ChangeLog.CREATE)
+            record_many(changed_links, ChangeLog.UPDATE)
+            transaction.on_commit(lambda: bump_version(LinkRegistry, now))
+            transaction.on_commit(invalidate)
+            return created
+
+        try:
+            created = run_write(apply)
+        except IntegrityError:
+            return Response(
+                {"detail": "Active link names must be unique."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response({
+            "created": self.get_serializer(created, many=True).data,
+            "updated": self.get_serializer(changed_links, many=True).data,
+            "deleted": delete_ids,
+        })
+
+class AsyncLinkRegistryViewSet(LinkRegistryViewSet, AsyncGenericViewSet):
+    """
+    LinkRegistryViewSet with native async reads, served under ASGI.
+    Writes keep their sync implementations and run in a worker thread.
+    """
+
+    async def list(self, request, *args, **kwargs):
+        # method_decorator() hides coroutines from adrf on Python < 3.12.
+        return await versioned_cache(LinkRegistry, User)(self.alist)(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = link_values(self.filter_queryset(self.get_queryset()))
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        return self.paginator.get_paginated_response(link_rows(page))
+
+    async def retrieve(self, request, *args, **kwargs):
+        try:
+            instance = await self.get_queryset().aget(pk=kwargs['pk'])
+        except (LinkRegistry.DoesNotExist, ValueError):
+            raise Http404
+        return Response(self.get_serializer(instance).data)
 
 def link_registry_view(request):
-    return render(request, 'link_registry/link_registry.html')
\ No newline at end of file
+    return render(request, 'link_registry/link_registry.html')
+
+def link_redirect(request, link_name):
+    target = resolve(link_name)
+    if target is None:
+        raise Http404("No active link with that name.")
+    link_id, link_url = target
+    hit_counter.add(link_id)
+    return HttpResponseRedirect(link_url)
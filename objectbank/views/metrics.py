@@ -0,0 +1,23 @@
+# Django imports
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+
+# Imports
+from ..metrics import prometheus_text, slow_samples
+
+def metrics_allowed(request):
+    if settings.DEBUG or request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    return bool(token) and request.META.get("HTTP_AUTHORIZATION") == f"Bearer {token}"
+
+# =============== METRICS VIEWS ===============
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(prometheus_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+def slow_requests_view(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return JsonResponse({"samples": list(slow_samples)})
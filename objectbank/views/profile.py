@@ -6,6 +6,10 @@ from django.shortcuts import (
     render, redirect, get_object_or_404
 )
 from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 # Imports
 from ..forms import (
     UserProfileEditForm
@@ -13,12 +17,41 @@ from ..forms import (
 from ..models import (
     UserProfile
 )
+from ..search import search_profiles, nearby_profiles
+from ..birthdays import upcoming_birthdays
+from ..archive import retire_user
+from ..db import run_write
+
+PROFILES_PAGE_SIZE = 48
+PROFILE_CARD_FIELDS = ('id', 'user_id', 'name', 'email', 'phone', 'dob', 'address')
+PROFILE_LOOKUPS = ('email', 'phone', 'pincode')
+NEARBY_MAX_RADIUS_KM = 500
+BIRTHDAYS_MAX_DAYS = 365
+NEARBY_MAX_K = 100
+
+def profile_page(request):
+    query = request.GET.get("q", "").strip()
+    after = request.GET.get("after", "")
+    after = int(after) if after.isdigit() else 0
+    # Retired users drop out at once, not at the next archive pass.
+    queryset = UserProfile.objects.filter(user__is_active=True).values(*PROFILE_CARD_FIELDS)
+    # Exact matches (?email=, ?phone=, ?pincode=) use the partial indexes.
+    for field in PROFILE_LOOKUPS:
+        value = request.GET.get(field, "").strip()
+        if value:
+            queryset = queryset.filter(**{field: value.lower() if field == "email" else value})
+    rows = list(search_profiles(queryset, query, after, PROFILES_PAGE_SIZE + 1))
+    has_next = len(rows) > PROFILES_PAGE_SIZE
+    rows = rows[:PROFILES_PAGE_SIZE]
+    return query, rows, rows[-1]["id"] if has_next else None
 
 # =============== AUTH VIEWS ===============
 def profiles(request):
     context = {}
-    user_profiles = UserProfile.objects.all()
+    query, user_profiles, next_after = profile_page(request)
     context["user_profiles"] = user_profiles
+    context["query"] = query
+    context["next_after"] = next_after
     return render(request, 'profile/profiles.html', context)
 
 def profile_edit(request):
@@ -57,6 +90,47 @@ def admin_profile_edit(request, user_id):
 def profile_delete(request, user_id):
     if request.method == "POST":
         user = get_object_or_404(User, id=user_id)
-        user.delete()
+        # Archived and purged by the next archive pass, not cascaded here.
+        run_write(retire_user, user)
         messages.success(request, "User deleted successfully!")
-    return redirect('profiles')
\ No newline at end of file
+    return redirect('profiles')
+
+# =============== REST API VIEWS ===============
+@api_view(['GET'])
+def profile_list(request):
+    query, user_profiles, next_after = profile_page(request)
+    return Response({"next_after": next_after, "results": user_profiles})
+
+@api_view(['GET'])
+# Rows carry coordinates that locate people; signed-in users only.
+@permission_classes([IsAuthenticated])
+def profile_nearby(request):
+    try:
+        lat = float(request.GET["lat"])
+        lng = float(request.GET["lng"])
+        radius_km = float(request.GET.get("radius_km", 5))
+        k = int(request.GET.get("k", 10))
+    except (KeyError, ValueError):
+        return Response({"detail": "lat and lng are required numbers."}, status=400)
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return Response({"detail": "lat/lng out of range."}, status=400)
+    if not (0 < radius_km <= NEARBY_MAX_RADIUS_KM and 0 < k <= NEARBY_MAX_K):
+        return Response(
+            {"detail": f"radius_km must be in (0, {NEARBY_MAX_RADIUS_KM}] and k in [1, {NEARBY_MAX_K}]."},
+            status=400,
+        )
+    return Response(nearby_profiles(lat, lng, radius_km, k))
+
+@api_view(['GET'])
+# Rows carry dates of birth; signed-in users only.
+@permission_classes([IsAuthenticated])
+def profile_birthdays(request):
+    try:
+        days = int(request.GET.get("days", 7))
+    except ValueError:
+        return Response({"detail": "days must be an integer."}, status=400)
+    if not 0 <= days <= BIRTHDAYS_MAX_DAYS:
+        return Response({"detail": f"days must be in [0, {BIRTHDAYS_MAX_DAYS}]."}, status=400)
+    today = timezone.localdate()
+    return Response({"today": today, "days": days, "results": upcoming_birthdays(today, days)})
+
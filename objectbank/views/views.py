@@ -1,15 +1,19 @@
 from django.shortcuts import render
 from django.http import HttpResponse
 from django.contrib import messages
+from ..caching import anonymous_page_cache
 
+@anonymous_page_cache()
 def home(request):
     messages.success(request, "Welcome to AG-PROJ01! 🎉")
     return render(request, 'home.html')
 
 # objectbank/views.py
-from rest_framework.decorators import api_view, permission_classes
+from adrf.decorators import api_view as async_api_view
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from ..throttling import WriteThrottle
 
 # Public read-only API
 @api_view(['GET'])
@@ -20,8 +24,24 @@ def public_api(request):
 # Default behavior: read for all, write for authenticated
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@throttle_classes([WriteThrottle])
 def items_api(request):
     if request.method == 'GET':
         return Response({"items": ["apple", "banana"]})
     elif request.method == 'POST':
-        return Response({"status": "Created by " + str(request.user.username)})
\ No newline at end of file
+        return Response({"status": "Created by " + str(request.user.username)})
+
+# Async variants, routed instead of the above under ASGI
+@async_api_view(['GET'])
+@permission_classes([AllowAny])
+async def apublic_api(request):
+    return Response({"message": "Anyone can see this"})
+
+@async_api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticatedOrReadOnly])
+@throttle_classes([WriteThrottle])
+async def aitems_api(request):
+    if request.method == 'GET':
+        return Response({"items": ["apple", "banana"]})
+    elif request.method == 'POST':
+        return Response({"status": "Created by " + str(request.user.username)})